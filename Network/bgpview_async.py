@@ -0,0 +1,277 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: asyncio version of the bgpview_v2.py Request* classes.
+Every getter is "async def" and never blocks the event loop, so thousands
+of lookups can be in flight on one loop. A semaphore caps how many
+requests go to the API at the same time. Needs aiohttp (pip install aiohttp).
+
+Example:
+    async def main():
+        lookups = [AsyncRequestASN(API_URL, asn) for asn in range(1, 1000)]
+        results = await asyncio.gather(*(t.get_asn_info() for t in lookups))
+        await AsyncRequestBGPapi.close_session()
+"""
+
+import asyncio
+import time
+import traceback
+
+import aiohttp
+
+from bgpview_cache import endpoint_type, memo_key, MemoCache
+from bgpview_ratelimit import backoff_delay, parse_retry_after
+from bgpview_v2 import (RequestBGPapi, RequestASN, RequestASNprefixes, RequestASNPeers,
+                        RequestANSupstreams, RequestASNdownstreams, RequestASNixs,
+                        RequestPrefix, RequestIPAddress, RequestInternetExchange,
+                        RequestBGPSearch, memo_get, memo_set, memo_restore, timed_getter)
+
+API_URL = "https://api.bgpview.io/"
+
+
+def run_blocking(func, *args):
+    """ Run func in the default thread pool and return an awaitable of its result.
+    For the SQLite response cache, every get and set commits to disk.
+    """
+    return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+class AsyncRequestBGPapi:
+    """ Async replacement of RequestBGPapi.run_bgpview_api.
+    Mix it in front of a Request* class, the parsing code is reused as is.
+    """
+
+    """ One aiohttp session and semaphore per event loop """
+    session = None
+    semaphore = None
+    session_loop = None
+    """ URL = task of the request in flight, callers of the same URL await it """
+    in_flight = {}
+    concurrency = 100
+    limit_per_host = 100
+
+    @classmethod
+    def configure(cls, concurrency=100, limit_per_host=100):
+        """ concurrency = max requests in flight on the event loop
+        limit_per_host = max open connections to api.bgpview.io
+        Takes effect on the next session created.
+        """
+        AsyncRequestBGPapi.concurrency = concurrency
+        AsyncRequestBGPapi.limit_per_host = limit_per_host
+
+    @classmethod
+    def get_session(cls):
+        """ Return the session of the running loop, create it on first use """
+        loop = asyncio.get_running_loop()
+        if (AsyncRequestBGPapi.session is None or AsyncRequestBGPapi.session.closed
+                or AsyncRequestBGPapi.session_loop is not loop):
+            connector = aiohttp.TCPConnector(limit=AsyncRequestBGPapi.concurrency,
+                                             limit_per_host=AsyncRequestBGPapi.limit_per_host,
+                                             ssl=False)
+            AsyncRequestBGPapi.session = aiohttp.ClientSession(connector=connector)
+            AsyncRequestBGPapi.semaphore = asyncio.Semaphore(AsyncRequestBGPapi.concurrency)
+            AsyncRequestBGPapi.session_loop = loop
+            AsyncRequestBGPapi.in_flight = {}
+        return AsyncRequestBGPapi.session
+
+    @classmethod
+    async def close_session(cls):
+        """ Close the session before the event loop stops """
+        if AsyncRequestBGPapi.session is not None and not AsyncRequestBGPapi.session.closed:
+            await AsyncRequestBGPapi.session.close()
+        AsyncRequestBGPapi.session = None
+
+    async def run_bgpview_api_async(self):
+        """ Same return value as run_bgpview_api, tuple(dict, str, str) """
+        self.data_from_api = None
+        self.api_status = None
+        self.api_status_message = None
+        bgpview_url = self.build_bgpview_url()
+
+        cache = RequestBGPapi.response_cache
+        if cache is not None:
+            meta_data = await run_blocking(cache.get, bgpview_url)
+            metrics = RequestBGPapi.metrics
+            if metrics is not None:
+                metrics.increment("bgpview_cache_lookups_total", cache="response",
+                                  result="miss" if meta_data is None else "hit")
+            if meta_data is not None:
+                self.data_from_api = meta_data
+                self.api_status = meta_data["status"]
+                self.api_status_message = meta_data["status_message"]
+                return self.data_from_api, self.api_status, self.api_status_message
+
+        session = self.get_session()
+        if RequestBGPapi.single_flight is None:
+            return await self.request_bgpview_api_async(session, bgpview_url)
+
+        """ Same URL already requested on this loop, share its answer """
+        in_flight = AsyncRequestBGPapi.in_flight
+        task = in_flight.get(bgpview_url)
+        if task is None:
+            task = asyncio.ensure_future(self.request_bgpview_api_async(session, bgpview_url))
+            in_flight[bgpview_url] = task
+            task.add_done_callback(lambda _: in_flight.pop(bgpview_url, None))
+        result = await asyncio.shield(task)
+        self.data_from_api, self.api_status, self.api_status_message = result
+        return result
+
+    async def request_bgpview_api_async(self, session, bgpview_url):
+        """ Send the request, retry it and store the answer in the response cache """
+        cache = RequestBGPapi.response_cache
+
+        """ When API request fails, retry it with exponential backoff.
+        Only exceptions, HTTP 429 and 5xx are retried, they wait for the
+        Retry-After header when the server sends one.
+        Every try waits on RequestBGPapi.rate_limiter like the sync client.
+        """
+        status_code = None
+        limiter = RequestBGPapi.rate_limiter
+        metrics = RequestBGPapi.metrics
+        endpoint = endpoint_type(self.api_endpoint)
+        for query_try in range(1, RequestBGPapi.max_tries + 1):
+            retry_after = None
+            try:
+                if limiter is not None:
+                    await limiter.acquire_async()
+                async with AsyncRequestBGPapi.semaphore:
+                    start = time.perf_counter()
+                    async with session.get(bgpview_url) as web_request:
+                        status_code = web_request.status
+                        content = await web_request.read()
+                        if metrics is not None:
+                            metrics.observe("bgpview_request_seconds", time.perf_counter() - start,
+                                            endpoint=endpoint)
+                            metrics.increment("bgpview_requests_total", endpoint=endpoint, code=str(status_code))
+                            metrics.increment("bgpview_response_bytes_total", len(content), endpoint=endpoint)
+                        if status_code == 200:
+                            start = time.perf_counter()
+                            meta_data = RequestBGPapi.json_decoder(content)
+                            if metrics is not None:
+                                metrics.observe("bgpview_decode_seconds", time.perf_counter() - start,
+                                                endpoint=endpoint)
+                            self.data_from_api = meta_data
+                            self.api_status = meta_data["status"]
+                            self.api_status_message = meta_data["status_message"]
+                            if cache is not None:
+                                await run_blocking(cache.set, bgpview_url, meta_data, endpoint_type(self.api_endpoint))
+                            if limiter is not None:
+                                await limiter.run_async(limiter.speed_up)
+                            break
+                        if status_code != 429 and status_code < 500:
+                            """ Any other 4xx answer is the same on the next try """
+                            print(f"===> ERROR: {bgpview_url} status code {status_code} <===\n")
+                            if metrics is not None:
+                                metrics.increment("bgpview_failures_total", endpoint=endpoint)
+                            break
+                        retry_after = parse_retry_after(web_request.headers.get("Retry-After"))
+                        if status_code == 429 and limiter is not None:
+                            await limiter.run_async(limiter.slow_down)
+
+            except Exception as e:
+                print(f"===> ERROR: {e.args} <===")
+                traceback.print_exc()
+                print()
+                if metrics is not None:
+                    metrics.increment("bgpview_errors_total", endpoint=endpoint, error=type(e).__name__)
+
+            if query_try == RequestBGPapi.max_tries:
+                print(f"===> ERROR: Query request to {bgpview_url} {query_try} times but failed. <===")
+                print(f"===> ERROR: {bgpview_url} status code {status_code} <===\n")
+                if metrics is not None:
+                    metrics.increment("bgpview_failures_total", endpoint=endpoint)
+                break
+
+            delay = backoff_delay(query_try, retry_after)
+            print(f"Query Try: {query_try}, status code {status_code}, sleep {delay:.1f} seconds")
+            if metrics is not None:
+                metrics.increment("bgpview_retries_total", endpoint=endpoint)
+            await asyncio.sleep(delay)
+
+        return self.data_from_api, self.api_status, self.api_status_message
+
+    async def run_getter_async(self, getter):
+        """ Answer from RequestBGPapi.result_memo without a request when possible,
+        otherwise fetch the data and parse it with the sync getter.
+        getter = memoized sync getter, its undecorated function parses the answer
+        so the memo is looked up once.
+        """
+        parse = getter.__wrapped__
+        if RequestBGPapi.result_memo is None:
+            return timed_getter(self, parse, await self.run_bgpview_api_async())
+
+        key = memo_key(self, parse.__qualname__)
+        entry = memo_get(key)
+        if entry is not MemoCache.MISSING:
+            return memo_restore(self, entry)
+        result = timed_getter(self, parse, await self.run_bgpview_api_async())
+        memo_set(self, key, result)
+        return result
+
+    async def get_records(self):
+        """ Run the async getter and return its bgpview_records objects """
+        await getattr(self, self.getter_name)()
+        return self.records
+
+
+class AsyncRequestASN(AsyncRequestBGPapi, RequestASN):
+    async def get_asn_info(self):
+        reserved = self.reserved_range()
+        if reserved is not None:
+            return self.get_reserved_info(reserved)
+        return await self.run_getter_async(RequestASN.get_asn_info)
+
+
+class AsyncRequestASNprefixes(AsyncRequestBGPapi, RequestASNprefixes):
+    async def get_asn_prefixes(self):
+        return await self.run_getter_async(RequestASNprefixes.get_asn_prefixes)
+
+
+class AsyncRequestASNPeers(AsyncRequestBGPapi, RequestASNPeers):
+    async def get_asn_peers(self):
+        return await self.run_getter_async(RequestASNPeers.get_asn_peers)
+
+
+class AsyncRequestANSupstreams(AsyncRequestBGPapi, RequestANSupstreams):
+    async def get_asn_upstreams(self):
+        return await self.run_getter_async(RequestANSupstreams.get_asn_upstreams)
+
+
+class AsyncRequestASNdownstreams(AsyncRequestBGPapi, RequestASNdownstreams):
+    async def get_asn_downstreams(self):
+        return await self.run_getter_async(RequestASNdownstreams.get_asn_downstreams)
+
+
+class AsyncRequestASNixs(AsyncRequestBGPapi, RequestASNixs):
+    async def get_asn_ixs(self):
+        return await self.run_getter_async(RequestASNixs.get_asn_ixs)
+
+
+class AsyncRequestPrefix(AsyncRequestBGPapi, RequestPrefix):
+    async def get_prefix(self):
+        return await self.run_getter_async(RequestPrefix.get_prefix)
+
+
+class AsyncRequestIPAddress(AsyncRequestBGPapi, RequestIPAddress):
+    async def get_ip_address(self):
+        return await self.run_getter_async(RequestIPAddress.get_ip_address)
+
+
+class AsyncRequestInternetExchange(AsyncRequestBGPapi, RequestInternetExchange):
+    async def get_internet_exchange(self):
+        return await self.run_getter_async(RequestInternetExchange.get_internet_exchange)
+
+
+class AsyncRequestBGPSearch(AsyncRequestBGPapi, RequestBGPSearch):
+    async def get_search_result(self):
+        return await self.run_getter_async(RequestBGPSearch.get_search_result)
+
+
+if __name__ == "__main__":
+    async def main():
+        lookups = [AsyncRequestASN(API_URL, asn) for asn in range(1, 101)]
+        for result in await asyncio.gather(*(t.get_asn_info() for t in lookups)):
+            print(result)
+        await AsyncRequestBGPapi.close_session()
+
+    asyncio.run(main())
@@ -0,0 +1,726 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Offline benchmarks for the bgpview_v2.py client. No request goes
+to api.bgpview.io, the payloads are synthetic and shaped like the real API.
+MockBGPView is a local HTTP stand in for every endpoint RequestBGPapi knows,
+with a configurable latency, error rate and payload size, or answers
+recorded once from the live API with --record. The HTTP benchmarks report
+throughput and p50/p99 latency, --save keeps them and --baseline compares a
+later run against them, so a slower client shows up without the real API.
+
+Example: python bgpview_bench.py parse --prefixes 50000
+Example: python bgpview_bench.py single sweep large-asn search --latency 0.02 --error-rate 0.01 --baseline bench.json
+"""
+
+import argparse
+import functools
+import ipaddress
+import json
+import math
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote_plus
+
+from bgpview_bulk import LOOKUPS, bulk_lookup, run_lookup
+from bgpview_cache import endpoint_type
+from bgpview_decode import load_decoder, iter_json_arrays, DECODERS
+from bgpview_metrics import Metrics, MetricsSink
+from bgpview_records import prefix_record
+from bgpview_lpm import PrefixIndex
+from bgpview_v2 import RequestBGPapi, RequestASNprefixes, RequestASNPeers, RequestIPAddress, RequestBGPSearch
+
+API_URL = "https://api.bgpview.io/"
+OK_STATUS = ("ok", "Query was successful")
+
+""" One key per bgpview_bulk lookup, for the single lookup benchmark and record_payloads() """
+SAMPLE_KEYS = {
+    "asn": 6939,
+    "prefixes": 6939,
+    "peers": 6939,
+    "upstreams": 6939,
+    "downstreams": 6939,
+    "ixs": 6939,
+    "ix": 1,
+    "prefix": "192.0.2.0/24",
+    "ip": "192.0.2.1",
+    "search": "digitalocean",
+}
+SEARCH_WORDS = ("digitalocean", "hurricane", "cloudflare", "google", "amazon", "akamai", "level3", "cogent")
+
+
+def fake_prefix(i, family="ipv4"):
+    """ One entry of the ipv4_prefixes/ipv6_prefixes list of /asn/as_number/prefixes """
+    if family == "ipv4":
+        prefix = f"{1 + i // 65536 % 223}.{i // 256 % 256}.{i % 256}.0/24"
+        parent = f"{1 + i // 65536 % 223}.0.0.0/8"
+    else:
+        prefix = f"2001:{i // 65536 % 65536:x}:{i % 65536:x}::/48"
+        parent = f"2001:{i // 65536 % 65536:x}::/32"
+    return {
+        "prefix": prefix,
+        "ip": prefix.split("/")[0],
+        "cidr": int(prefix.split("/")[1]),
+        "roa_status": "Valid",
+        "name": f"NET-{i}",
+        "description": f"Customer network {i}",
+        "country_code": "US",
+        "parent": {"prefix": parent, "ip": parent.split("/")[0], "cidr": int(parent.split("/")[1]),
+                   "rir_name": "ARIN", "allocation_status": "allocated"},
+    }
+
+
+def fake_asn(i):
+    """ One entry of the ipv4_peers/ipv4_upstreams/... lists """
+    return {"asn": i, "name": f"AS-{i}", "description": f"Network {i} LLC", "country_code": "DE"}
+
+
+def fake_prefixes_payload(count):
+    """ AS6939 sized /asn/as_number/prefixes answer, 1/3 of the prefixes are IPv6 """
+    ipv6_count = count // 3
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"ipv4_prefixes": [fake_prefix(i) for i in range(count - ipv6_count)],
+                     "ipv6_prefixes": [fake_prefix(i, "ipv6") for i in range(ipv6_count)]}}
+
+
+def fake_peers_payload(count):
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"ipv4_peers": [fake_asn(i) for i in range(1, count + 1)],
+                     "ipv6_peers": [fake_asn(i) for i in range(1, count // 2 + 1)]}}
+
+
+def fake_ip_payload(ip):
+    """ /ip/ip_address answer, the covering /24 (IPv4) or /48 (IPv6) announced by AS6939 """
+    if ":" in ip:
+        prefix = str(ipaddress.ip_network(f"{ip}/48", strict=False))
+    else:
+        prefix = ip.rsplit(".", 1)[0] + ".0/24"
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"ip": ip, "ptr_record": None,
+                     "prefixes": [{"prefix": prefix, "ip": prefix.split("/")[0], "cidr": int(prefix.split("/")[1]),
+                                   "asn": {"asn": 6939, "name": "HURRICANE",
+                                           "description": "Hurricane Electric LLC", "country_code": "US"},
+                                   "name": "NET", "description": "Customer network", "country_code": "US"}]}}
+
+
+def fake_asn_payload(asn):
+    """ /asn/as_number answer """
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"asn": int(asn), "name": f"AS-{asn}", "description_short": f"Network {asn} LLC",
+                     "description_full": [], "country_code": "US", "website": None,
+                     "email_contacts": [], "abuse_contacts": [], "looking_glass": None,
+                     "traffic_estimation": None, "traffic_ratio": None, "owner_address": [],
+                     "rir_allocation": {"rir_name": "ARIN", "country_code": "US",
+                                        "date_allocated": "2001-01-01 00:00:00", "allocation_status": "assigned"},
+                     "iana_assignment": {"assignment_status": "assigned", "description": None,
+                                         "whois_server": "whois.arin.net", "date_assigned": None},
+                     "date_updated": "2021-05-15 07:42:08"}}
+
+
+def fake_relations_payload(relation, count):
+    """ /asn/as_number/upstreams or /downstreams answer, relation = "upstreams" or "downstreams" """
+    data = {f"ipv4_{relation}": [fake_asn(i) for i in range(1, count + 1)],
+            f"ipv6_{relation}": [fake_asn(i) for i in range(1, count // 2 + 1)]}
+    if relation == "upstreams":
+        data.update({"ipv4_graph": None, "ipv6_graph": None, "combined_graph": None})
+    return {"status": "ok", "status_message": "Query was successful", "data": data}
+
+
+def fake_ix_port(i, ix_id=None):
+    port = {"asn": i, "name": f"AS-{i}", "description": f"Network {i} LLC", "country_code": "NL",
+            "ipv4_address": f"80.249.{i // 256 % 256}.{i % 256}", "ipv6_address": f"2001:7f8:1::a500:{i:x}:1",
+            "speed": 10000}
+    if ix_id is not None:
+        port.update({"ix_id": ix_id, "name": f"IX-{ix_id}", "name_full": f"Internet Exchange {ix_id}",
+                     "city": "Amsterdam"})
+    return port
+
+
+def fake_ixs_payload(count):
+    """ /asn/as_number/ixs answer, one port at each of count IXs """
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": [fake_ix_port(6939, ix_id) for ix_id in range(1, count + 1)]}
+
+
+def fake_prefix_detail_payload(prefix):
+    """ /prefix/ip_address/cidr answer """
+    network, _, cidr = prefix.partition("/")
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"prefix": prefix, "ip": network, "cidr": int(cidr or 24),
+                     "asns": [dict(fake_asn(6939), prefix_upstreams=[fake_asn(i) for i in range(1, 4)])],
+                     "name": "NET", "description_short": "Customer network", "description_full": [],
+                     "email_contacts": [], "abuse_contacts": [], "owner_address": [],
+                     "country_codes": {"whois_country_code": "US", "rir_allocation_country_code": "US",
+                                       "maxmind_country_code": "US"},
+                     "rir_allocation": {"rir_name": "ARIN", "country_code": "US", "ip": network,
+                                        "cidr": int(cidr or 24), "prefix": prefix,
+                                        "date_allocated": "2001-01-01 00:00:00", "allocation_status": "allocated"},
+                     "maxmind": {}, "date_updated": "2021-05-15 07:42:08"}}
+
+
+def fake_ix_payload(ix_id, count):
+    """ /ix/ix_id answer with count member ports """
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"id": int(ix_id), "name": f"IX-{ix_id}", "name_full": f"Internet Exchange {ix_id}",
+                     "website": None, "tech_email": None, "tech_phone": None, "policy_email": None,
+                     "policy_phone": None, "city": "Amsterdam", "country_code": "NL", "url_stats": None,
+                     "members_count": count, "members": [fake_ix_port(i) for i in range(1, count + 1)]}}
+
+
+def fake_search_payload(query, count):
+    """ /search?query_term= answer, count ASNs and prefixes named after the query """
+    name = query.upper()
+    prefixes = fake_prefixes_payload(count)["data"]
+    for line in prefixes["ipv4_prefixes"] + prefixes["ipv6_prefixes"]:
+        line.pop("parent")
+        line["name"] = f"{name}-{line['name']}"
+    return {"status": "ok", "status_message": "Query was successful",
+            "data": {"asns": [dict(fake_asn(i), name=f"{name}-{i}", email_contacts=[], abuse_contacts=[],
+                                   rir_name="ARIN") for i in range(1, count + 1)],
+                     "ipv4_prefixes": prefixes["ipv4_prefixes"], "ipv6_prefixes": prefixes["ipv6_prefixes"],
+                     "internet_exchanges": [{"ix_id": i, "name": f"{name}-IX-{i}", "name_full": f"{query} IX {i}",
+                                             "country_code": "NL", "city": "Amsterdam"}
+                                            for i in range(1, count // 10 + 2)]}}
+
+
+def mock_path(path):
+    """ Return (endpoint type, key) of a request path, "/asn/6939/prefixes" = ("asn/prefixes", "6939") """
+    path, _, query = path.partition("?")
+    parts = [part for part in path.split("/") if part]
+    if not parts:
+        return None, None
+    if parts[0] == "asn" and len(parts) == 3:
+        return f"asn/{parts[2]}", parts[1]
+    if parts[0] == "prefix":
+        return "prefix", "/".join(parts[1:3])
+    if parts[0] == "search":
+        return "search", unquote_plus(query.partition("query_term=")[2].split("&")[0])
+    if len(parts) == 2 and parts[0] in ("asn", "ip", "ix"):
+        return parts[0], parts[1]
+    return None, None
+
+
+@functools.lru_cache(maxsize=4096)
+def mock_body(endpoint, key, size):
+    """ Encoded synthetic answer of one endpoint, size = entries of its lists """
+    if endpoint == "asn":
+        payload = fake_asn_payload(key)
+    elif endpoint == "asn/prefixes":
+        payload = fake_prefixes_payload(size)
+    elif endpoint == "asn/peers":
+        payload = fake_peers_payload(size)
+    elif endpoint in ("asn/upstreams", "asn/downstreams"):
+        payload = fake_relations_payload(endpoint[4:], size)
+    elif endpoint == "asn/ixs":
+        payload = fake_ixs_payload(size)
+    elif endpoint == "prefix":
+        payload = fake_prefix_detail_payload(key)
+    elif endpoint == "ip":
+        payload = fake_ip_payload(key)
+    elif endpoint == "ix":
+        payload = fake_ix_payload(key, size)
+    else:
+        payload = fake_search_payload(key, size)
+    return json.dumps(payload).encode()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """ Answers every endpoint of RequestBGPapi like api.bgpview.io, settings come from MockBGPView """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        endpoint, key = mock_path(self.path)
+        delay, failed = server.next_answer()
+        if delay:
+            time.sleep(delay)
+
+        if endpoint is None:
+            status, body = 404, json.dumps({"status": "error", "status_message": "Not Found"}).encode()
+        elif failed:
+            status, body = 503, json.dumps({"status": "error", "status_message": "Service Unavailable"}).encode()
+        else:
+            status = 200
+            body = server.recorded.get(endpoint) or mock_body(endpoint, key, server.size)
+        server.count(endpoint, status, len(body))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockBGPView(ThreadingHTTPServer):
+    """ Local stand in for api.bgpview.io on a free port.
+    latency, jitter = seconds every answer waits, latency + random up to jitter
+    error_rate = share of requests answered 503 with Retry-After: 0
+    size = entries of the list endpoints (prefixes, peers, IX members, search hits)
+    payload_dir = recorded answers, one <endpoint type>.json per endpoint with
+    "/" as "_" (asn.json, asn_prefixes.json, ix.json...), served for every key
+    Used as a context manager, every Request* object talks to it meanwhile.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, size=100, payload_dir=None, seed=6939):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.size = size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.errors = 0
+        self.bytes_sent = 0
+        self.recorded = {}
+        if payload_dir is not None:
+            for file_name in os.listdir(payload_dir):
+                if file_name.endswith(".json"):
+                    with open(os.path.join(payload_dir, file_name), "rb") as payload_file:
+                        self.recorded[file_name[:-5].replace("_", "/")] = payload_file.read()
+        self.previous_base = None
+        self.previous_limiter = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    def next_answer(self):
+        """ Return (seconds to wait, True when this answer is an error) """
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            return delay, self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def count(self, endpoint, status, size):
+        with self.lock:
+            self.requests[endpoint] += 1
+            self.bytes_sent += size
+            if status != 200:
+                self.errors += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        self.previous_base = RequestBGPapi.api_base
+        self.previous_limiter = RequestBGPapi.rate_limiter
+        RequestBGPapi.api_base = self.base_url
+        """ The mock has no request rate to respect, the benchmarks measure the client """
+        RequestBGPapi.rate_limiter = None
+        RequestBGPapi.session = None
+        return self
+
+    def __exit__(self, *exc_info):
+        RequestBGPapi.api_base = self.previous_base
+        RequestBGPapi.rate_limiter = self.previous_limiter
+        RequestBGPapi.session = None
+        self.shutdown()
+        self.server_close()
+
+
+def record_payloads(payload_dir, keys=None):
+    """ Save one live api.bgpview.io answer per endpoint for MockBGPView(payload_dir=...) """
+    os.makedirs(payload_dir, exist_ok=True)
+    for lookup, key in (keys or SAMPLE_KEYS).items():
+        request_class, _ = LOOKUPS[lookup]
+        request = request_class(API_URL, key)
+        request.run_bgpview_api()
+        if request.data_from_api is None:
+            print(f"===> ERROR: no answer for {lookup} {key}, not recorded <===")
+            continue
+        path = os.path.join(payload_dir, endpoint_type(request.api_endpoint).replace("/", "_") + ".json")
+        with open(path, "w") as payload_file:
+            json.dump(request.data_from_api, payload_file)
+        print(f"Recorded {lookup} {key} to {path}")
+
+
+def legacy_parse_prefixes(data, asn_ip_var=6939):
+    """ Loops of RequestASNprefixes.get_asn_prefixes before the single pass extractors,
+    as they were, strings only. Return the four attributes the getter set.
+    """
+    ipv4_prefixes = []
+    ipv4_parent_prefixes = []
+    ipv6_prefixes = []
+    ipv6_parent_prefixes = []
+
+    for line in data["ipv4_prefixes"]:
+        for k, v in line.items():
+            if type(v) == dict:
+                if v["prefix"] is not None:
+                    parent = v["prefix"]
+                    ipv4_parent_prefixes.append(parent)
+            elif k == "prefix":
+                ip = v
+            elif k == "description":
+                name = v
+            elif k == "country_code":
+                location = v
+                ipv4_info = f"<{ip} {name} ({location}>)"
+                ipv4_prefixes.append(ipv4_info)
+
+    for line in data["ipv6_prefixes"]:
+        for k, v in line.items():
+            if type(v) == dict:
+                if v["prefix"] is not None:
+                    parent = v["prefix"]
+                    ipv6_parent_prefixes.append(parent)
+            elif k == "prefix":
+                ip = v
+            elif k == "description":
+                name = v
+            elif k == "country_code":
+                location = v
+                ipv6_info = f"<{ip} {name} ({location}>)"
+                ipv6_prefixes.append(ipv6_info)
+
+    ipv4_prefixes.insert(0, f"AS Number {asn_ip_var} IPv4 Prefixes .....")
+    ipv4_parent_prefixes.insert(0, f"AS Number {asn_ip_var} IPv4 Parent Prefixes .....")
+    ipv6_prefixes.insert(0, f"AS Number {asn_ip_var} IPv6 Prefixes .....")
+    ipv6_parent_prefixes.insert(0, f"AS Number {asn_ip_var} IPv6 Parent Prefixes .....")
+    return (ipv4_prefixes, list(dict.fromkeys(ipv4_parent_prefixes)),
+            ipv6_prefixes, list(dict.fromkeys(ipv6_parent_prefixes)))
+
+
+def legacy_parse_peers(data, asn_ip_var=6939):
+    """ Loops of RequestASNPeers.get_asn_peers before the single pass extractors,
+    as they were, strings only. Return the two attributes the getter set.
+    """
+    ipv4_peers = []
+    ipv6_peers = []
+
+    for line in data["ipv4_peers"]:
+        for k, v in line.items():
+            if k == "asn":
+                asn = f"ASN: {v}"
+            elif k == "description":
+                name = f"Name: {v}"
+            elif k == "country_code":
+                location = f"Location: {v}"
+                ipv4_asn_info = f"<{asn} -- {name} -- {location}>"
+                ipv4_peers.append(ipv4_asn_info)
+
+    for line in data["ipv6_peers"]:
+        for k, v in line.items():
+            if k == "asn":
+                asn = f"ASN: {v}"
+            elif k == "description":
+                name = f"Name: {v}"
+            elif k == "country_code":
+                location = f"Location: {v}"
+                ipv6_asn_info = f"<{asn} -- {name} -- {location}>"
+                ipv6_peers.append(ipv6_asn_info)
+
+    ipv4_peers.insert(0, f"AS Number {asn_ip_var} IPv4 Peering Partners .....")
+    ipv6_peers.insert(0, f"AS Number {asn_ip_var} IPv6 Peering Partners .....")
+    return ipv4_peers, ipv6_peers
+
+
+def best_time(func, repeat):
+    """ Fastest of repeat runs in seconds """
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        run_time = time.perf_counter() - start_time
+        if best is None or run_time < best:
+            best = run_time
+    return best
+
+
+def report(name, count, run_time, baseline=None):
+    line = f"{name:<40} {run_time * 1000:10.2f} ms {count / run_time:14,.0f} records/s"
+    if baseline is not None:
+        line += f"  {baseline / run_time:5.2f}x"
+    print(line)
+
+
+def bench_parse(args):
+    """ Key loops of the old getters against the getters now, which format the
+    strings straight from the API lines, and get_records(), which also builds
+    the records with the single pass extractors
+    """
+    prefixes = fake_prefixes_payload(args.prefixes)
+    peers = fake_peers_payload(args.peers)
+    prefix_count = args.prefixes
+    peer_count = args.peers + args.peers // 2
+
+    def new_prefixes():
+        RequestASNprefixes("", 6939).get_asn_prefixes((prefixes, *OK_STATUS))
+
+    def new_peers():
+        RequestASNPeers("", 6939).get_asn_peers((peers, *OK_STATUS))
+
+    def new_prefix_records():
+        RequestASNprefixes("", 6939).get_records((prefixes, *OK_STATUS))
+
+    def new_peer_records():
+        RequestASNPeers("", 6939).get_records((peers, *OK_STATUS))
+
+    legacy = best_time(lambda: legacy_parse_prefixes(prefixes["data"]), args.repeat)
+    report("prefixes legacy loop", prefix_count, legacy)
+    report("prefixes get_asn_prefixes", prefix_count, best_time(new_prefixes, args.repeat), legacy)
+    report("prefixes get_records", prefix_count, best_time(new_prefix_records, args.repeat), legacy)
+
+    legacy = best_time(lambda: legacy_parse_peers(peers["data"]), args.repeat)
+    report("peers legacy loop", peer_count, legacy)
+    report("peers get_asn_peers", peer_count, best_time(new_peers, args.repeat), legacy)
+    report("peers get_records", peer_count, best_time(new_peer_records, args.repeat), legacy)
+
+
+def peak_memory(func):
+    """ Peak Python memory in MB while func runs """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decode(args):
+    """ Full decode with every installed decoder against streaming the prefix arrays """
+    raw = json.dumps(fake_prefixes_payload(args.prefixes)).encode()
+    count = args.prefixes
+    print(f"payload {len(raw) / 1024 / 1024:.1f} MB, {count} prefixes")
+
+    def stream():
+        chunks = (raw[i:i + 65536] for i in range(0, len(raw), 65536))
+        for key, line in iter_json_arrays(chunks, ("ipv4_prefixes", "ipv6_prefixes")):
+            prefix_record(line, key[:4], 6939)
+
+    for name in DECODERS:
+        try:
+            decode = load_decoder(name)[1]
+        except ImportError:
+            print(f"{name:<40} not installed")
+            continue
+        run_time = best_time(lambda: decode(raw), args.repeat)
+        report(f"decode {name}", count, run_time)
+        print(f"{'':<40} peak {peak_memory(lambda: decode(raw)):8.1f} MB")
+
+    report("stream iter_json_arrays + records", count, best_time(stream, args.repeat))
+    print(f"{'':<40} peak {peak_memory(stream):8.1f} MB")
+
+
+def bench_lpm(args):
+    """ Local PrefixIndex lookups against one RequestIPAddress call per IP """
+    payload = fake_prefixes_payload(args.prefixes)["data"]
+    index = PrefixIndex()
+    build_time = best_time(lambda: index.add_records(
+        [prefix_record(line, "ipv4", 6939) for line in payload["ipv4_prefixes"]] +
+        [prefix_record(line, "ipv6", 6939) for line in payload["ipv6_prefixes"]]), 1)
+    report("build PrefixIndex", len(index), build_time)
+
+    random_ips = random.Random(6939)
+    ipv4 = [f"{1 + i // 65536 % 223}.{i // 256 % 256}.{i % 256}.{random_ips.randrange(256)}"
+            for i in (random_ips.randrange(len(payload["ipv4_prefixes"])) for _ in range(args.lookups))]
+    ipv6 = [f"2001:{i // 65536 % 65536:x}:{i % 65536:x}::{random_ips.randrange(65536):x}"
+            for i in (random_ips.randrange(len(payload["ipv6_prefixes"])) for _ in range(args.lookups // 4))]
+
+    def lookup_all(ips):
+        lookup = index.lookup
+        for ip in ips:
+            lookup(ip)
+
+    report("PrefixIndex.lookup IPv4", len(ipv4), best_time(lambda: lookup_all(ipv4), args.repeat))
+    report("PrefixIndex.lookup IPv6", len(ipv6), best_time(lambda: lookup_all(ipv6), args.repeat))
+
+    """ Per IP HTTP path against the mock server, no real network latency """
+    http_ips = ipv4[:args.http_lookups]
+
+    def http_all():
+        for ip in http_ips:
+            RequestIPAddress(API_URL, ip).get_records()
+
+    with MockBGPView():
+        report("RequestIPAddress per IP (local mock)", len(http_ips), best_time(http_all, 1))
+
+
+class LatencySink(MetricsSink):
+    """ RequestBGPapi.metrics that keeps every value of one histogram, for exact percentiles """
+
+    def __init__(self, name="bgpview_lookup_seconds"):
+        self.name = name
+        self.values = []
+
+    def observe(self, name, value, **labels):
+        if name == self.name:
+            self.values.append(value)
+
+
+def percentile(values, share):
+    """ Nearest rank percentile of a sorted list, share = 0.99 for p99 """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(share * len(values)) - 1))]
+
+
+def report_latency(name, count, run_time, latencies):
+    """ Print throughput and p50/p99 latency, return them for --save and --baseline """
+    latencies = sorted(latencies)
+    result = {"throughput": count / run_time if run_time else 0.0,
+              "p50": percentile(latencies, 0.50), "p99": percentile(latencies, 0.99)}
+    print(f"{name:<40} {result['throughput']:10,.0f} /s  p50 {result['p50'] * 1000:8.2f} ms  "
+          f"p99 {result['p99'] * 1000:8.2f} ms")
+    return result
+
+
+def mock_server(args, size=None):
+    return MockBGPView(args.latency, args.jitter, args.error_rate, size or args.payload_size, args.payload_dir)
+
+
+def timed_lookups(calls):
+    """ Run every call, return (seconds of all, seconds of each) """
+    latencies = []
+    start_time = time.perf_counter()
+    for call in calls:
+        call_start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_start)
+    return time.perf_counter() - start_time, latencies
+
+
+def bench_single(args):
+    """ One lookup at a time, every endpoint, HTTP + decode + parse """
+    results = {}
+    with mock_server(args) as server:
+        for lookup, key in SAMPLE_KEYS.items():
+            run_time, latencies = timed_lookups([lambda: run_lookup(lookup, key)] * args.requests)
+            results[f"single {lookup}"] = report_latency(f"single {lookup}", args.requests, run_time, latencies)
+        print(f"{'':<40} server errors {server.errors}, {server.bytes_sent / 1024 / 1024:.1f} MB sent")
+    return results
+
+
+def bench_sweep(args):
+    """ bgpview_bulk sweep of --sweep ASNs with --workers threads and no rate limit """
+    sink = LatencySink()
+    previous_metrics = RequestBGPapi.metrics
+    RequestBGPapi.metrics = sink
+    try:
+        with mock_server(args) as server:
+            start_time = time.perf_counter()
+            count = sum(1 for _ in bulk_lookup(args.sweep_lookup, range(1, args.sweep + 1),
+                                               workers=args.workers, rate=None))
+            run_time = time.perf_counter() - start_time
+            result = report_latency(f"sweep {'+'.join(args.sweep_lookup)} x{args.workers}", count, run_time,
+                                    sink.values)
+            print(f"{'':<40} server requests {sum(server.requests.values())}, errors {server.errors}")
+    finally:
+        RequestBGPapi.metrics = previous_metrics
+    return {"sweep": result}
+
+
+def bench_large_asn(args):
+    """ /asn/as_number/prefixes of an AS6939 sized ASN over HTTP, split into request, decode and parse """
+    metrics = Metrics()
+    previous_metrics = RequestBGPapi.metrics
+    RequestBGPapi.metrics = metrics
+    try:
+        with mock_server(args, size=args.prefixes):
+            run_time, latencies = timed_lookups(
+                [lambda: RequestASNprefixes(API_URL, 6939).get_asn_prefixes()] * args.repeat)
+    finally:
+        RequestBGPapi.metrics = previous_metrics
+    result = report_latency("large-asn get_asn_prefixes", args.repeat, run_time, latencies)
+    report("large-asn prefixes", args.prefixes * args.repeat, run_time)
+    for name, values in metrics.summary().items():
+        print(f"{'':<40} {name:<24} {values['average'] * 1000:8.2f} ms average")
+    return {"large-asn": result}
+
+
+def bench_search(args):
+    """ RequestBGPSearch over HTTP, --payload-size hits per result list """
+    queries = [SEARCH_WORDS[i % len(SEARCH_WORDS)] + str(i // len(SEARCH_WORDS)) for i in range(args.requests)]
+    with mock_server(args):
+        run_time, latencies = timed_lookups(
+            [functools.partial(lambda query: RequestBGPSearch(API_URL, query).get_records(), query)
+             for query in queries])
+    return {"search": report_latency("search get_records", len(queries), run_time, latencies)}
+
+
+def compare_baseline(results, baseline, tolerance):
+    """ Return the lines of every result slower than the baseline by more than tolerance """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if result["throughput"] < old["throughput"] * (1 - tolerance):
+            regressions.append(f"{name} throughput {result['throughput']:,.0f}/s, baseline {old['throughput']:,.0f}/s")
+        if result["p99"] > old["p99"] * (1 + tolerance):
+            regressions.append(f"{name} p99 {result['p99'] * 1000:.2f} ms, baseline {old['p99'] * 1000:.2f} ms")
+    return regressions
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "decode": bench_decode,
+    "lpm": bench_lpm,
+    "single": bench_single,
+    "sweep": bench_sweep,
+    "large-asn": bench_large_asn,
+    "search": bench_search,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline bgpview_v2.py benchmarks")
+    parser.add_argument("benchmark", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--prefixes", type=int, default=50000, help="Prefixes in the large ASN payload")
+    parser.add_argument("--peers", type=int, default=10000, help="IPv4 peers in the peers payload")
+    parser.add_argument("--lookups", type=int, default=1000000, help="IPv4 lookups in the lpm benchmark")
+    parser.add_argument("--http-lookups", type=int, default=300, help="Per IP API calls in the lpm benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the fastest is reported")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint in single and search")
+    parser.add_argument("--sweep", type=int, default=5000, help="ASNs in the sweep benchmark")
+    parser.add_argument("--sweep-lookup", action="append", choices=sorted(LOOKUPS),
+                        help="Lookup of the sweep benchmark, repeat for more (default: asn)")
+    parser.add_argument("--workers", type=int, default=16, help="Threads of the sweep benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock server waits per answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds per answer, up to this")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock answers that are HTTP 503")
+    parser.add_argument("--payload-size", type=int, default=100, help="Entries of the mock list answers")
+    parser.add_argument("--payload-dir", help="Serve the answers recorded with --record instead of synthetic ones")
+    parser.add_argument("--record", metavar="DIR", help="Record one live API answer per endpoint to DIR and exit")
+    parser.add_argument("--save", help="Write the HTTP benchmark results to this JSON file")
+    parser.add_argument("--baseline", help="Results file of an earlier --save to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Slowdown against the baseline that fails the run")
+    args = parser.parse_args(argv)
+    for name in args.benchmark:
+        if name not in BENCHMARKS:
+            parser.error(f"Unknown benchmark {name!r}, choose from {', '.join(BENCHMARKS)}")
+    args.sweep_lookup = args.sweep_lookup or ["asn"]
+
+    if args.record:
+        record_payloads(args.record)
+        return
+
+    results = {}
+    for name in args.benchmark or BENCHMARKS:
+        print(f"===> {name} <===")
+        results.update(BENCHMARKS[name](args) or {})
+        print()
+
+    if args.save:
+        with open(args.save, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_baseline(results, json.load(baseline_file), args.tolerance)
+        for line in regressions:
+            print(f"===> REGRESSION: {line} <===")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
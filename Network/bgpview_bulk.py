@@ -0,0 +1,231 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Bulk lookup engine for bgpview_v2.py. Fan ASN, prefixes, peers,
+upstreams, downstreams, IXs, prefix, IP and search queries out over a
+bounded pool of worker threads, share one rate limiter between all of
+them, and yield every result as soon as it completes.
+
+Example: python bgpview_bulk.py --lookup asn --start 0 --end 65555 --workers 16 --rate 5
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from itertools import chain
+
+from bgpview_v2 import (RequestBGPapi, RequestASN, RequestASNprefixes, RequestASNPeers,
+                        RequestANSupstreams, RequestASNdownstreams, RequestASNixs,
+                        RequestPrefix, RequestIPAddress, RequestInternetExchange,
+                        RequestBGPSearch)
+from bgpview_export import open_writer, export_results, EXPORT_FORMATS
+from bgpview_journal import SweepJournal
+from bgpview_metrics import Metrics, dump_while
+from bgpview_ratelimit import TokenBucket
+
+API_URL = "https://api.bgpview.io/"
+
+""" Lookup name = (Request* class, getter method name) """
+LOOKUPS = {
+    "asn": (RequestASN, "get_asn_info"),
+    "prefixes": (RequestASNprefixes, "get_asn_prefixes"),
+    "peers": (RequestASNPeers, "get_asn_peers"),
+    "upstreams": (RequestANSupstreams, "get_asn_upstreams"),
+    "downstreams": (RequestASNdownstreams, "get_asn_downstreams"),
+    "ixs": (RequestASNixs, "get_asn_ixs"),
+    "ix": (RequestInternetExchange, "get_internet_exchange"),
+    "prefix": (RequestPrefix, "get_prefix"),
+    "ip": (RequestIPAddress, "get_ip_address"),
+    "search": (RequestBGPSearch, "get_search_result"),
+}
+
+""" Lookups keyed by AS number, reserved ASNs are answered without the thread pool """
+ASN_LOOKUPS = ("asn", "prefixes", "peers", "upstreams", "downstreams", "ixs")
+
+""" Answer of a reserved ASN, journaled like an API answer so a replay knows it was local """
+RESERVED_MESSAGE = "Reserved ASN, answered locally"
+
+""" lookup = LOOKUPS name, key = ASN/IP/IX/Prefix, result = getter return value,
+data = decoded API answer, None when it was not fetched,
+records = bgpview_records objects of the getter, None when the query failed """
+BulkResult = namedtuple("BulkResult", ["lookup", "key", "result", "data", "records"])
+
+
+def run_lookup(lookup, key):
+    """ Run one getter, run_bgpview_api waits on the shared rate limiter """
+    request_class, getter_name = LOOKUPS[lookup]
+    request = request_class(API_URL, key)
+    start = time.perf_counter()
+    result = getattr(request, getter_name)()
+    if RequestBGPapi.metrics is not None:
+        RequestBGPapi.metrics.observe("bgpview_lookup_seconds", time.perf_counter() - start, lookup=lookup)
+    return BulkResult(lookup, key, result, getattr(request, "data_from_api", None), request.records)
+
+
+def reserved_result(lookup, key):
+    """ BulkResult of a reserved ASN, RequestASN answers it locally, the other
+    ASN lookups have no records. data is a local "ok" answer, so exports,
+    journals and refresh treat it as answered. None when the key is a normal ASN.
+    """
+    reserved_asns = RequestBGPapi.reserved_asns
+    if lookup not in ASN_LOOKUPS or reserved_asns is None or key not in reserved_asns:
+        return None
+    data = {"status": "ok", "status_message": RESERVED_MESSAGE, "data": None}
+    if lookup == "asn":
+        item = run_lookup(lookup, key)
+        return item._replace(data=data)
+    return BulkResult(lookup, key, None, data, [])
+
+
+def run_tasks(tasks, workers, max_pending):
+    """ Yield BulkResult for every (key, lookup) task, at most max_pending queued """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for key, lookup in tasks:
+            local_result = reserved_result(lookup, key)
+            if local_result is not None:
+                yield local_result
+                continue
+            pending.add(executor.submit(run_lookup, lookup, key))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def bulk_lookup(lookups, keys, workers=8, rate=5, limiter=None, max_pending=None, journal=None):
+    """ Yield BulkResult for every (key, lookup) pair as it completes.
+    ASNs in RequestBGPapi.reserved_asns are answered locally, without a request.
+    lookups = list of LOOKUPS names, ["asn", "prefixes", ...]
+    keys = any iterable of ASN/IP/IX/Prefix, read lazily
+    workers = number of threads calling the API at the same time
+    rate = global requests per second for all workers, None for no limit
+    limiter = TokenBucket to use instead of rate, share one between processes
+              with TokenBucket(rate, state_file="bgpview_rate.state")
+    max_pending = max queued tasks, keeps memory bounded on huge key ranges
+    journal = bgpview_journal.SweepJournal, pairs already in it are skipped
+              and every answered query is appended to it
+    """
+    for lookup in lookups:
+        if lookup not in LOOKUPS:
+            raise ValueError(f"Unknown lookup {lookup!r}, choose from {', '.join(LOOKUPS)}")
+
+    if limiter is None and rate is not None:
+        limiter = TokenBucket(rate)
+    RequestBGPapi.rate_limiter = limiter
+    if max_pending is None:
+        max_pending = workers * 4
+
+    """ One connection per worker thread in the shared session pool """
+    if RequestBGPapi.session is None or RequestBGPapi.pool_maxsize < workers:
+        RequestBGPapi.configure_session(pool_maxsize=max(workers, RequestBGPapi.pool_maxsize))
+
+    tasks = ((key, lookup) for key in keys for lookup in lookups)
+    if journal is None:
+        yield from run_tasks(tasks, workers, max_pending)
+        return
+
+    tasks = ((key, lookup) for key, lookup in tasks if (lookup, key) not in journal)
+    for item in run_tasks(tasks, workers, max_pending):
+        """ Failed queries stay out of the journal, the next run asks again """
+        if item.data is not None or item.records is not None:
+            journal.record(item.lookup, item.key, item.result, item.data)
+        yield item
+
+
+def parse_data(lookup, key, data):
+    """ bgpview_records objects of a journaled API answer, parsed again by its getter """
+    if data is None:
+        return None
+    if data.get("status_message") == RESERVED_MESSAGE:
+        local_result = reserved_result(lookup, key)
+        return local_result.records if local_result is not None else None
+    request_class, _ = LOOKUPS[lookup]
+    return request_class(API_URL, key).get_records((data, data.get("status"), data.get("status_message")))
+
+
+def journal_results(journal):
+    """ BulkResult of every query the previous runs wrote to the journal """
+    for lookup, key, result, data in journal.replay():
+        yield BulkResult(lookup, key, result, data, parse_data(lookup, key, data))
+
+
+def read_keys(args):
+    """ Keys come from --keys, --keys-file or the --start/--end ASN range """
+    if args.keys:
+        return args.keys
+    if args.keys_file:
+        with open(args.keys_file) as keys_file:
+            return [line.strip() for line in keys_file if line.strip()]
+    return range(args.start, args.end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk BGPView API lookups")
+    parser.add_argument("--lookup", action="append", choices=sorted(LOOKUPS),
+                        help="Lookup to run for every key, repeat for more (default: asn)")
+    parser.add_argument("--start", type=int, default=0, help="First AS number of the range")
+    parser.add_argument("--end", type=int, default=65555, help="Stop before this AS number")
+    parser.add_argument("--keys", nargs="+", help="ASN/IP/IX/Prefix list instead of a range")
+    parser.add_argument("--keys-file", help="File with one ASN/IP/IX/Prefix per line")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--rate-file", help="Share the request rate with other processes using this file")
+    parser.add_argument("--reserved-file", help="More reserved/unallocated ASN ranges, one \"start-end kind\" per line")
+    parser.add_argument("--journal", help="Journal file, a restarted sweep skips the queries already in it")
+    parser.add_argument("--metrics-file", help="Write Prometheus text format metrics to this file while running")
+    parser.add_argument("--metrics-interval", type=float, default=10, help="Seconds between two metrics file writes")
+    parser.add_argument("--output", help="Stream records to this file instead of printing results")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output extension)")
+    args = parser.parse_args(argv)
+
+    lookups = args.lookup or ["asn"]
+    start_time = datetime.now()
+    count = 0
+
+    if args.reserved_file:
+        RequestBGPapi.reserved_asns.load(args.reserved_file)
+
+    limiter = TokenBucket(args.rate, state_file=args.rate_file)
+    journal = SweepJournal(args.journal) if args.journal else None
+    results = bulk_lookup(lookups, read_keys(args), workers=args.workers, limiter=limiter, journal=journal)
+    if journal is not None:
+        """ Output = queries done by the previous runs, then the new ones """
+        print(f"Journal {args.journal}: {len(journal)} queries already done", file=sys.stderr)
+        results = chain(journal_results(journal), results)
+    if args.metrics_file:
+        if RequestBGPapi.metrics is None:
+            RequestBGPapi.metrics = Metrics()
+        results = dump_while(results, RequestBGPapi.metrics, args.metrics_file, args.metrics_interval)
+
+    try:
+        if args.output:
+            """ The journal replays every earlier record, so the output starts over """
+            writer = open_writer(args.output, args.format, append=journal is None)
+            try:
+                count = export_results(results, writer)
+            finally:
+                writer.close()
+            print(f"Wrote {count} records to {args.output}, Running Time: {datetime.now() - start_time}", file=sys.stderr)
+            return
+
+        for item in results:
+            count += 1
+            print(f"{item.lookup} {item.key}: {item.result}")
+    finally:
+        if journal is not None:
+            journal.close()
+
+    print(f"Finished {count} queries, Running Time: {datetime.now() - start_time}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Persistent SQLite cache for BGPView API responses.
+Responses are keyed by the resolved bgpview_url, expire after a TTL per
+endpoint type, and the least recently used entries are removed when the
+cache is full. Turn it on for every Request* object with
+
+    RequestBGPapi.response_cache = ResponseCache("bgpview_cache.db")
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+""" Seconds to keep a response, per endpoint type """
+DAY = 86400
+DEFAULT_TTLS = {
+    "asn": 7 * DAY,
+    "asn/prefixes": DAY,
+    "asn/peers": DAY,
+    "asn/upstreams": DAY,
+    "asn/downstreams": DAY,
+    "asn/ixs": 7 * DAY,
+    "prefix": DAY,
+    "ip": DAY,
+    "ix": 7 * DAY,
+    "search": DAY,
+}
+
+URL_PLACEHOLDERS = ("as_number", "ip_address", "cidr", "ix_id")
+
+
+def endpoint_type(api_endpoint):
+    """ Turn an endpoint template into its type
+    "https://api.bgpview.io/asn/as_number/prefixes" = "asn/prefixes"
+    "https://api.bgpview.io/prefix/ip_address/cidr" = "prefix"
+    "https://api.bgpview.io/search?query_term=digitalocean" = "search"
+    """
+    path = api_endpoint.split("bgpview.io/")[-1].split("?")[0]
+    return "/".join(part for part in path.split("/") if part and part not in URL_PLACEHOLDERS)
+
+
+class ResponseCache:
+    """ SQLite backed response cache, safe to share between threads and processes """
+
+    def __init__(self, path="bgpview_cache.db", max_entries=500000, ttls=None, default_ttl=DAY):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                               url TEXT PRIMARY KEY,
+                               endpoint TEXT,
+                               payload BLOB,
+                               expires REAL,
+                               last_access REAL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.db.commit()
+        self.entries = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """ Return the decoded response, or None when missing or expired """
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT payload, expires FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE responses SET last_access = ? WHERE url = ?", (now, url))
+            self.db.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, url, meta_data, endpoint="", ttl=None):
+        """ Store the decoded response for the endpoint type TTL """
+        if ttl is None:
+            ttl = self.ttls.get(endpoint, self.default_ttl)
+        now = time.time()
+        payload = zlib.compress(json.dumps(meta_data, separators=(",", ":")).encode())
+        with self.lock:
+            """ Only a new URL adds an entry, a refreshed one replaces its row """
+            cursor = self.db.execute("""UPDATE responses SET endpoint = ?, payload = ?, expires = ?, last_access = ?
+                                        WHERE url = ?""", (endpoint, payload, now + ttl, now, url))
+            if cursor.rowcount == 0:
+                self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                (url, endpoint, payload, now + ttl, now))
+                self.entries += 1
+            if self.entries > self.max_entries:
+                self.evict()
+            self.db.commit()
+
+    def evict(self):
+        """ Drop expired entries, then the least recently used down to 90% of max_entries """
+        self.db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        self.entries = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        extra = self.entries - int(self.max_entries * 0.9)
+        if extra > 0:
+            self.db.execute("""DELETE FROM responses WHERE url IN (
+                                   SELECT url FROM responses ORDER BY last_access LIMIT ?)""", (extra,))
+            self.evictions += extra
+            self.entries -= extra
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+            self.entries = 0
+
+    def stats(self):
+        """ Return hit and miss counters of this process """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self.entries,
+        }
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class MemoCache:
+    """ In memory LRU of parsed getter results, for example the tuple
+    returned by RequestASN.get_asn_info. Thread safe, bounded by maxsize,
+    entries older than ttl seconds are fetched again.
+    Turn it on for every Request* object with
+
+        RequestBGPapi.result_memo = MemoCache(maxsize=10000, ttl=3600)
+
+    Results are shared between callers, do not modify them.
+    """
+
+    """ get() returns MISSING on a miss, None is a valid getter result """
+    MISSING = object()
+
+    def __init__(self, maxsize=10000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.results.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return MemoCache.MISSING
+            self.results.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, result):
+        with self.lock:
+            self.results[key] = (time.monotonic() + self.ttl, result)
+            self.results.move_to_end(key)
+            while len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.results),
+        }
+
+
+class SingleFlight:
+    """ Concurrent calls with the same key share one run of the function.
+    The first caller runs it, the others wait and get the same result (or
+    exception). Used by run_bgpview_api so threads asking for the same URL
+    at the same moment send one request.
+    Results are shared between callers, do not modify them.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.leaders = 0
+        self.shared = 0
+        self.lock = threading.Lock()
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                """ [done event, result, exception] """
+                call = self.calls[key] = [threading.Event(), None, None]
+                self.leaders += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+
+        try:
+            call[1] = func()
+            return call[1]
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call[0].set()
+
+    def stats(self):
+        calls = self.leaders + self.shared
+        return {
+            "requests": self.leaders,
+            "shared": self.shared,
+            "shared_ratio": self.shared / calls if calls else 0.0,
+            "in_flight": len(self.calls),
+        }
+
+
+def memo_key(request, getter_name):
+    """ Same key for RequestASN(a, 13335) no matter how often it is rebuilt """
+    return getter_name, str(request.asn_ip_var)
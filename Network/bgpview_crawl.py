@@ -0,0 +1,169 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Breadth first topology crawler. Start from seed ASNs, query their
+upstreams/downstreams/peers with bgpview_bulk, add every new neighbor to the
+next level and stop at --depth. Every ASN is queried once. The frontier,
+visited set and the AS graph built so far are saved to a checkpoint file,
+so an interrupted crawl resumes where it stopped.
+
+Example: python bgpview_crawl.py 6939 --depth 3 --checkpoint crawl.json --save crawl.graph
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from bgpview_bulk import bulk_lookup
+from bgpview_export import open_writer, export_results, EXPORT_FORMATS
+from bgpview_graph import AsGraph
+
+CRAWL_LOOKUPS = ["upstreams", "downstreams", "peers"]
+
+
+class TopologyCrawler:
+    """ Level by level crawl, depth 0 = the seeds.
+    checkpoint = JSON file with the crawl state, the graph goes next to it
+    in checkpoint + ".graph". Both are loaded again when they exist.
+    """
+
+    def __init__(self, seeds, lookups=None, max_depth=2, checkpoint=None,
+                 workers=8, rate=5, checkpoint_every=500):
+        self.lookups = lookups or ["upstreams", "downstreams"]
+        self.max_depth = max_depth
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.rate = rate
+        self.checkpoint_every = checkpoint_every
+        self.graph = AsGraph()
+        self.depth = 0
+        self.frontier = list(dict.fromkeys(int(asn) for asn in seeds))
+        self.next_frontier = set()
+        self.visited = set(self.frontier)
+        """ ASNs of the current level with every lookup answered """
+        self.done = set()
+        self.queries = 0
+        self.failed = 0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load_checkpoint()
+
+    def load_checkpoint(self):
+        with open(self.checkpoint) as checkpoint_file:
+            state = json.load(checkpoint_file)
+        self.lookups = state["lookups"]
+        self.depth = state["depth"]
+        self.frontier = state["frontier"]
+        self.next_frontier = set(state["next_frontier"])
+        self.visited = set(state["visited"])
+        self.done = set(state["done"])
+        if os.path.exists(f"{self.checkpoint}.graph"):
+            self.graph = AsGraph.load(f"{self.checkpoint}.graph")
+        print(f"Resume crawl at depth {self.depth}, {len(self.frontier) - len(self.done)} ASNs left "
+              f"in this level, {len(self.visited)} ASNs seen", file=sys.stderr)
+
+    def save_checkpoint(self):
+        """ Write the graph then the state, each to a temp file renamed over the old one """
+        if self.checkpoint is None:
+            return
+        self.graph.save(f"{self.checkpoint}.graph.tmp")
+        os.replace(f"{self.checkpoint}.graph.tmp", f"{self.checkpoint}.graph")
+        state = {
+            "lookups": self.lookups,
+            "depth": self.depth,
+            "frontier": self.frontier,
+            "next_frontier": sorted(self.next_frontier),
+            "visited": sorted(self.visited),
+            "done": sorted(self.done),
+        }
+        with open(f"{self.checkpoint}.tmp", "w") as checkpoint_file:
+            json.dump(state, checkpoint_file)
+        os.replace(f"{self.checkpoint}.tmp", self.checkpoint)
+
+    def crawl(self):
+        """ Yield bgpview_bulk.BulkResult for every query, level by level """
+        while self.frontier and self.depth <= self.max_depth:
+            todo = [asn for asn in self.frontier if asn not in self.done]
+            answers = {}
+            since_checkpoint = 0
+
+            for item in bulk_lookup(self.lookups, todo, workers=self.workers, rate=self.rate):
+                self.queries += 1
+                if item.records:
+                    self.graph.add_records(item.key, item.records)
+                    if self.depth < self.max_depth:
+                        for record in item.records:
+                            if record.asn is not None and record.asn not in self.visited:
+                                self.visited.add(record.asn)
+                                self.next_frontier.add(record.asn)
+                if item.data is None and item.records is None:
+                    """ Failed, the key stays out of done so a resumed crawl asks again """
+                    self.failed += 1
+                else:
+                    answers[item.key] = answers.get(item.key, 0) + 1
+                    if answers[item.key] == len(self.lookups):
+                        self.done.add(item.key)
+                yield item
+
+                since_checkpoint += 1
+                if since_checkpoint >= self.checkpoint_every:
+                    self.save_checkpoint()
+                    since_checkpoint = 0
+
+            self.depth += 1
+            self.frontier = sorted(self.next_frontier)
+            self.next_frontier = set()
+            self.done = set()
+            self.save_checkpoint()
+
+    def run(self):
+        """ Crawl without keeping the results, return the graph """
+        for _ in self.crawl():
+            pass
+        return self.graph
+
+    def stats(self):
+        return {
+            "depth": self.depth,
+            "visited": len(self.visited),
+            "queries": self.queries,
+            "failed": self.failed,
+            "links": len(self.graph.targets),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Breadth first crawl of the AS topology")
+    parser.add_argument("seeds", nargs="+", type=int, help="ASNs to start from")
+    parser.add_argument("--depth", type=int, default=2, help="Levels of neighbors to follow")
+    parser.add_argument("--lookup", action="append", choices=CRAWL_LOOKUPS,
+                        help="Relationship to follow, repeat for more (default: upstreams and downstreams)")
+    parser.add_argument("--checkpoint", help="Save the crawl state to this file and resume from it")
+    parser.add_argument("--checkpoint-every", type=int, default=500, help="Queries between checkpoints")
+    parser.add_argument("--save", help="Write the AS graph to this file, read it with AsGraph.load()")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--output", help="Stream records to this file")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output extension)")
+    args = parser.parse_args(argv)
+
+    start_time = datetime.now()
+    crawler = TopologyCrawler(args.seeds, args.lookup, args.depth, args.checkpoint,
+                              workers=args.workers, rate=args.rate, checkpoint_every=args.checkpoint_every)
+    if args.output:
+        writer = open_writer(args.output, args.format)
+        try:
+            export_results(crawler.crawl(), writer)
+        finally:
+            writer.close()
+    else:
+        crawler.run()
+
+    if args.save:
+        crawler.graph.save(args.save)
+    print(f"===> {crawler.stats()}, Running Time: {datetime.now() - start_time} <===", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: JSON decoders for BGPView API answers.
+load_decoder() picks the fastest decoder installed: orjson, then simdjson,
+then the standard json module. iter_json_arrays() streams the items of big
+arrays such as ipv4_prefixes/ipv6_prefixes straight from the HTTP response,
+one item at a time, without building the whole document in memory.
+"""
+
+import codecs
+import json
+import re
+from itertools import chain
+
+DECODERS = ("orjson", "simdjson", "json")
+
+
+def load_decoder(name=None):
+    """ Return (name, decode function), decode takes bytes or str.
+    name = "orjson", "simdjson" or "json", None for the fastest installed
+    """
+    for decoder_name in ([name] if name else DECODERS):
+        if decoder_name == "orjson":
+            try:
+                import orjson
+                return "orjson", orjson.loads
+            except ImportError:
+                continue
+        elif decoder_name == "simdjson":
+            try:
+                import simdjson
+                return "simdjson", simdjson.loads
+            except ImportError:
+                continue
+        elif decoder_name == "json":
+            return "json", json.loads
+        else:
+            raise ValueError(f"Unknown JSON decoder {decoder_name!r}, choose from {', '.join(DECODERS)}")
+    raise ImportError(f"JSON decoder {name!r} is not installed")
+
+
+def peek_status(chunks, limit=4096):
+    """ Return (status, status_message, chunks) of a streamed BGPView answer.
+    The API sends status and status_message before data, they are read from the
+    first chunks, the returned chunks start over with the bytes already read.
+    status is None when the first limit bytes do not hold it.
+    """
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if b'"data"' in head or len(head) >= limit:
+            break
+    text = head.split(b'"data"', 1)[0].decode("utf-8", "replace")
+    fields = []
+    for name in ("status", "status_message"):
+        match = re.search(rf'"{name}"\s*:\s*"((?:[^"\\]|\\.)*)"', text)
+        fields.append(json.loads(f'"{match.group(1)}"') if match else None)
+    return fields[0], fields[1], chain([head], chunks)
+
+
+def iter_json_arrays(chunks, keys):
+    """ Yield (key, item) for every item of the arrays named in keys.
+    chunks = iterable of bytes, for example response.iter_content(65536)
+    keys = array names, ("ipv4_prefixes", "ipv6_prefixes")
+    Only the current item is kept in memory. The array name is found by its
+    quoted "key": text, keep the names specific enough not to appear in values.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    markers = [(key, f'"{key}"') for key in keys]
+    buffer = ""
+    position = 0
+    current_key = None
+    chunks = iter(chunks)
+    finished = False
+
+    def read_more():
+        nonlocal buffer, position, finished
+        chunk = next(chunks, None)
+        if chunk is None:
+            finished = True
+            buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+    while True:
+        if current_key is None:
+            """ Look for the next array name followed by ":" and "[" """
+            found = None
+            for key, marker in markers:
+                index = buffer.find(marker, position)
+                if index != -1 and (found is None or index < found[1]):
+                    found = (key, index + len(marker))
+            if found is not None:
+                bracket = buffer.find("[", found[1])
+                if bracket != -1 and buffer[found[1]:bracket].strip() == ":":
+                    current_key = found[0]
+                    position = bracket + 1
+                    continue
+                if bracket == -1 and not finished:
+                    read_more()
+                    continue
+                position = found[1]
+                continue
+            if finished:
+                return
+            """ Keep a tail in case a marker is split between two chunks """
+            longest = max(len(marker) for _, marker in markers)
+            position = max(position, len(buffer) - longest - 8)
+            read_more()
+            continue
+
+        """ Inside an array, skip spaces and commas, then decode one item """
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer):
+            if finished:
+                return
+            read_more()
+            continue
+        if buffer[position] == "]":
+            position += 1
+            current_key = None
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if finished:
+                raise
+            read_more()
+            continue
+        if end == len(buffer) and not finished:
+            """ A number at the end of the buffer may continue in the next chunk """
+            read_more()
+            continue
+        position = end
+        yield current_key, item
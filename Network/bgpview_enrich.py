@@ -0,0 +1,173 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Batch IP enrichment. Take any number of IP addresses, group them
+by their covering block (/24 for IPv4, /48 for IPv6), query the API once per
+block and fan the answer back out to every IP, in input order.
+Flow logs with thousands of IPs in the same /24 cost one API call.
+
+Example: python bgpview_enrich.py flow_ips.txt --output enriched.ndjson
+"""
+
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bgpview_lpm import IPResolver, ip_to_int, BITS
+from bgpview_ratelimit import TokenBucket
+from bgpview_v2 import RequestBGPapi, RequestIPAddress
+
+API_URL = "https://api.bgpview.io/"
+
+""" Longest prefix the Internet routing table accepts, all IPs in one block share their prefix """
+BLOCK_LENGTH = {4: 24, 6: 48}
+
+
+def block_of(family, ip_int):
+    """ Key of the /24 or /48 block holding the IP """
+    return family, ip_int >> (BITS[family] - BLOCK_LENGTH[family])
+
+
+class BatchEnricher:
+    """ Keeps the learned prefixes between batches, so later batches hit the local index """
+
+    def __init__(self, resolver=None, workers=8):
+        self.resolver = resolver if resolver is not None else IPResolver()
+        self.workers = workers
+        """ Blocks the API has no prefix for, private and unrouted space """
+        self.empty_blocks = set()
+        """ PrefixIndex.add is not thread safe, fetch() workers add one at a time """
+        self.lock = threading.Lock()
+        self.api_calls = 0
+        self.ips = 0
+
+    def query_api(self, ip):
+        """ One RequestIPAddress call, learned prefixes go into the shared index.
+        Return True when the API knows a prefix for the IP, False when it
+        answered without one, None when the request failed.
+        """
+        request = RequestIPAddress(API_URL, ip)
+        detail = request.get_records()
+        if detail is not None and detail.prefixes:
+            with self.lock:
+                self.resolver.index.add_records(detail.prefixes)
+            return True
+        if detail is not None and getattr(request, "api_status", None) == "ok":
+            return False
+        return None
+
+    def fetch(self, ips):
+        """ Query the API for every IP in ips, at most workers at the same time.
+        Return {ip: query_api() result}
+        """
+        self.api_calls += len(ips)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip(ips, executor.map(self.query_api, ips)))
+
+    def enrich_batch(self, ips):
+        """ Return [(ip, PrefixRecord or None)] in the same order as ips """
+        index = self.resolver.index
+        parsed = []
+        missing_blocks = {}
+
+        for ip in ips:
+            try:
+                family, ip_int = ip_to_int(ip)
+            except (OSError, ValueError):
+                parsed.append(None)
+                continue
+            parsed.append((family, ip_int))
+            if index.lookup_int(family, ip_int) is None:
+                block = block_of(family, ip_int)
+                if block not in self.empty_blocks:
+                    missing_blocks.setdefault(block, ip)
+
+        """ One representative IP per block not covered yet """
+        if missing_blocks:
+            found = self.fetch(list(missing_blocks.values()))
+            """ Only an ok answer without prefixes marks a block empty, failed blocks
+            are skipped in this batch and asked again by the next one """
+            failed_blocks = set()
+            for block, ip in missing_blocks.items():
+                if found[ip] is False:
+                    self.empty_blocks.add(block)
+                elif found[ip] is None:
+                    failed_blocks.add(block)
+
+            """ An answer more specific than the block does not cover every IP, ask for the rest """
+            leftovers = {}
+            for ip, address in zip(ips, parsed):
+                if address is None or ip in found or index.lookup_int(*address) is not None:
+                    continue
+                block = block_of(*address)
+                if block not in self.empty_blocks and block not in failed_blocks:
+                    leftovers.setdefault(address, ip)
+            if leftovers:
+                self.fetch(list(leftovers.values()))
+
+        self.ips += len(ips)
+        return [(ip, index.lookup_int(*address) if address is not None else None)
+                for ip, address in zip(ips, parsed)]
+
+    def enrich(self, ips, batch_size=10000):
+        """ Yield (ip, PrefixRecord or None) for every IP in input order, batch by batch """
+        batch = []
+        for ip in ips:
+            batch.append(ip)
+            if len(batch) >= batch_size:
+                yield from self.enrich_batch(batch)
+                batch = []
+        if batch:
+            yield from self.enrich_batch(batch)
+
+    def stats(self):
+        return {
+            "ips": self.ips,
+            "api_calls": self.api_calls,
+            "ips_per_call": self.ips / self.api_calls if self.api_calls else None,
+            "prefixes": len(self.resolver.index),
+        }
+
+
+def enrich_ips(ips, workers=8, batch_size=10000, resolver=None):
+    """ Shortcut for BatchEnricher(resolver, workers).enrich(ips, batch_size) """
+    return BatchEnricher(resolver, workers).enrich(ips, batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich IP addresses with prefix and origin ASN")
+    parser.add_argument("ips_file", nargs="?", help="File with one IP per line (default: stdin)")
+    parser.add_argument("--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--batch-size", type=int, default=10000, help="IPs grouped per batch")
+    args = parser.parse_args(argv)
+
+    RequestBGPapi.rate_limiter = TokenBucket(args.rate)
+    RequestBGPapi.configure_session(pool_maxsize=max(args.workers, RequestBGPapi.pool_maxsize))
+
+    source = open(args.ips_file) if args.ips_file else sys.stdin
+    output = open(args.output, "w") if args.output else sys.stdout
+    enricher = BatchEnricher(workers=args.workers)
+    try:
+        ips = (line.strip() for line in source if line.strip())
+        for ip, record in enricher.enrich(ips, args.batch_size):
+            row = {"ip": ip, "prefix": None, "asn": None, "name": None, "description": None, "country": None}
+            if record is not None:
+                row.update(prefix=record.prefix, asn=record.asn, name=record.name,
+                           description=record.asn_description or record.description,
+                           country=record.country)
+            output.write(json.dumps(row) + "\n")
+    finally:
+        if args.ips_file:
+            source.close()
+        if args.output:
+            output.close()
+
+    print(f"===> {enricher.stats()} <===", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Stream BGPView results to NDJSON, CSV or Parquet files.
+The bgpview_records objects of every answer are split into flat records,
+one per ASN, prefix, peer, upstream, downstream or IX member, and written
+as soon as they arrive, so a 65k ASN sweep never has to fit in memory.
+Parquet needs pyarrow.
+
+Example: python bgpview_bulk.py --lookup asn --lookup prefixes --output asn.ndjson
+"""
+
+import csv
+import json
+
+""" Column name = Parquet type, every record has these keys """
+FIELDS = {
+    "lookup": "string",
+    "key": "string",
+    "record": "string",
+    "family": "string",
+    "asn": "int64",
+    "name": "string",
+    "description": "string",
+    "country": "string",
+    "prefix": "string",
+    "parent": "string",
+    "ip": "string",
+    "ix_id": "int64",
+    "ix_name": "string",
+    "city": "string",
+    "ipv4_address": "string",
+    "ipv6_address": "string",
+    "speed": "int64",
+    "date_allocated": "string",
+    "date_updated": "string",
+}
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+
+def new_record(lookup, key, record, **values):
+    """ Record with every FIELDS key, missing values are None """
+    row = dict.fromkeys(FIELDS)
+    row.update(lookup=lookup, key=str(key), record=record)
+    row.update(values)
+    return row
+
+
+def item_records(lookup, key, records):
+    """ Yield flat records from the bgpview_records objects of one answer (BulkResult.records).
+    lookup = bgpview_bulk.LOOKUPS name the answer came from
+    """
+    if records is None:
+        return
+
+    if lookup == "asn":
+        yield new_record(lookup, key, "asn", asn=records.asn, name=records.name,
+                         description=records.description, country=records.country,
+                         date_allocated=records.date_allocated, date_updated=records.date_updated)
+
+    elif lookup == "prefixes":
+        for record in records:
+            yield new_record(lookup, key, "prefix", family=record.family, asn=record.asn,
+                             prefix=record.prefix, parent=record.parent, name=record.name,
+                             description=record.description, country=record.country)
+
+    elif lookup in ("peers", "upstreams", "downstreams"):
+        for record in records:
+            yield new_record(lookup, key, record.relation, family=record.family, asn=record.asn,
+                             name=record.name, description=record.description, country=record.country)
+
+    elif lookup == "ixs":
+        for record in records:
+            yield new_record(lookup, key, "ix_member", asn=record.asn, ix_id=record.ix_id,
+                             name=record.name, ix_name=record.name_full, country=record.country,
+                             city=record.city, ipv4_address=record.ipv4_address,
+                             ipv6_address=record.ipv6_address, speed=record.speed)
+
+    elif lookup == "ix":
+        for record in records.members:
+            yield new_record(lookup, key, "ix_member", ix_id=records.ix_id, ix_name=records.name_full,
+                             city=records.city, asn=record.asn, description=record.description,
+                             country=record.country, ipv4_address=record.ipv4_address,
+                             ipv6_address=record.ipv6_address, speed=record.speed)
+
+    elif lookup == "prefix":
+        for record in records.asns or [None]:
+            yield new_record(lookup, key, "prefix", prefix=records.prefix, name=records.name,
+                             description=records.description, country=records.country,
+                             date_allocated=records.date_allocated,
+                             asn=record.asn if record is not None else None)
+
+    elif lookup == "ip":
+        for record in records.prefixes or [None]:
+            if record is None:
+                yield new_record(lookup, key, "ip", ip=records.ip)
+                continue
+            yield new_record(lookup, key, "ip", ip=records.ip, prefix=record.prefix, name=record.name,
+                             description=record.description, country=record.country, asn=record.asn)
+
+    elif lookup == "search":
+        for record in records.asns:
+            yield new_record(lookup, key, "asn", asn=record.asn, name=record.name,
+                             description=record.description, country=record.country)
+        for record in records.ipv4_prefixes + records.ipv6_prefixes:
+            yield new_record(lookup, key, "prefix", family=record.family, prefix=record.prefix,
+                             name=record.name, description=record.description, country=record.country)
+        for record in records.internet_exchanges:
+            yield new_record(lookup, key, "ix", ix_id=record.ix_id, ix_name=record.name_full,
+                             name=record.name, country=record.country, city=record.city)
+
+
+class NDJSONWriter:
+    """ One JSON object per line, append = False starts the file over """
+    def __init__(self, path, append=True):
+        self.output = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record):
+        self.output.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.output.close()
+
+
+class CSVWriter:
+    """ One row per record, header written once for a new file, append = False starts the file over """
+    def __init__(self, path, append=True):
+        self.output = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.output, fieldnames=list(FIELDS))
+        if self.output.tell() == 0:
+            self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+    def close(self):
+        self.output.close()
+
+
+class ParquetWriter:
+    """ Buffer batch_size records, then write them as one Parquet row group """
+    def __init__(self, path, batch_size=50000):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, kind)()) for name, kind in FIELDS.items()])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.batch = []
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.writer.write_table(self.pyarrow.Table.from_pylist(self.batch, schema=self.schema))
+            self.batch = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_writer(path, export_format=None, append=True):
+    """ Pick the writer from export_format or from the file extension.
+    append = False truncates an existing NDJSON/CSV file, Parquet files are always new
+    """
+    if export_format is None:
+        export_format = path.rsplit(".", 1)[-1].lower()
+        if export_format in ("json", "jsonl"):
+            export_format = "ndjson"
+    if export_format == "ndjson":
+        return NDJSONWriter(path, append)
+    if export_format == "csv":
+        return CSVWriter(path, append)
+    if export_format == "parquet":
+        return ParquetWriter(path)
+    raise ValueError(f"Unknown export format {export_format!r}, choose from {', '.join(EXPORT_FORMATS)}")
+
+
+def export_results(results, writer):
+    """ Write the records of every bgpview_bulk.BulkResult, return the record count """
+    count = 0
+    for item in results:
+        for record in item_records(item.lookup, item.key, item.records):
+            writer.write(record)
+            count += 1
+    return count
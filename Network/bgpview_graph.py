@@ -0,0 +1,316 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: AS relationship graph built from RequestASNPeers, RequestANSupstreams
+and RequestASNdownstreams records. Edges are kept in compact adjacency
+arrays (CSR): every ASN gets a node number, its neighbors sit next to each
+other in one array('I') with one flag byte per edge for the relationship
+and the IPv4/IPv6 families. Customer cones, upstream paths, transit
+dependency and k-hop neighborhoods then run in memory, no API request.
+
+Example: python bgpview_graph.py --keys 6939 13335 --cone 6939 --path 13335
+"""
+
+import argparse
+import struct
+from array import array
+from collections import deque
+
+from bgpview_bulk import bulk_lookup, read_keys
+
+""" Edge flags, relationship of the neighbor seen from the node """
+PROVIDER = 1
+CUSTOMER = 2
+PEER = 4
+IPV4 = 8
+IPV6 = 16
+RELATIONS = PROVIDER | CUSTOMER | PEER
+FAMILIES = {None: IPV4 | IPV6, "ipv4": IPV4, "ipv6": IPV6}
+
+""" Relation of an AsnRecord = (flag from the queried ASN, flag back from the neighbor) """
+RECORD_RELATIONS = {
+    "upstream": (PROVIDER, CUSTOMER),
+    "downstream": (CUSTOMER, PROVIDER),
+    "peer": (PEER, PEER),
+}
+
+MAGIC = b"BGPVGRF\0"
+HEADER = struct.Struct("<8sII")
+
+
+class AsGraph:
+    """ Add edges with add_edge()/add_records(), queries build the arrays once.
+    nodes = array of ASNs, node number = position
+    offsets = array, neighbors of node n are targets[offsets[n]:offsets[n + 1]]
+    targets = array of neighbor node numbers, flags = bytearray, one per target
+    """
+
+    def __init__(self):
+        self.node_ids = {}
+        self.nodes = array("I")
+        self.offsets = array("I", [0])
+        self.targets = array("I")
+        self.flags = bytearray()
+        """ Edges added since the arrays were built, {(node, neighbor): flags} """
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node(self, asn):
+        """ Node number of an ASN, a new one for an ASN never seen """
+        asn = int(asn)
+        node = self.node_ids.get(asn)
+        if node is None:
+            node = self.node_ids[asn] = len(self.nodes)
+            self.nodes.append(asn)
+        return node
+
+    def add_edge(self, asn, neighbor, flags):
+        """ Add or widen the edge asn -> neighbor, flags = relationship | family """
+        key = (self.node(asn), self.node(neighbor))
+        self.pending[key] = self.pending.get(key, 0) | flags
+
+    def add_records(self, asn, records):
+        """ Add the AsnRecord list of RequestASNPeers, RequestANSupstreams or
+        RequestASNdownstreams get_records() for the queried asn, both directions
+        """
+        for record in records:
+            relation = RECORD_RELATIONS.get(record.relation)
+            if relation is None or record.asn is None:
+                continue
+            family = FAMILIES.get(record.family, IPV4 | IPV6)
+            self.add_edge(asn, record.asn, relation[0] | family)
+            self.add_edge(record.asn, asn, relation[1] | family)
+
+    def build(self):
+        """ Merge pending edges into the adjacency arrays """
+        if not self.pending:
+            return
+        edges = {}
+        for node in range(len(self.offsets) - 1):
+            for position in range(self.offsets[node], self.offsets[node + 1]):
+                edges[(node, self.targets[position])] = self.flags[position]
+        for key, flags in self.pending.items():
+            edges[key] = edges.get(key, 0) | flags
+        self.pending = {}
+
+        counts = [0] * (len(self.nodes) + 1)
+        for node, _ in edges:
+            counts[node + 1] += 1
+        for node in range(len(self.nodes)):
+            counts[node + 1] += counts[node]
+        self.offsets = array("I", counts)
+        self.targets = array("I", [0]) * len(edges)
+        self.flags = bytearray(len(edges))
+        fill = list(counts)
+        for (node, neighbor), flags in sorted(edges.items()):
+            self.targets[fill[node]] = neighbor
+            self.flags[fill[node]] = flags
+            fill[node] += 1
+
+    def neighbors(self, node, relations=RELATIONS, family=None):
+        """ Yield neighbor node numbers joined by any of relations in family """
+        family_mask = FAMILIES[family]
+        targets = self.targets
+        flags = self.flags
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            edge_flags = flags[position]
+            if edge_flags & relations and edge_flags & family_mask:
+                yield targets[position]
+
+    def edges(self, asn, family=None):
+        """ Return [(neighbor ASN, "provider"/"customer"/"peer")] of one ASN """
+        self.build()
+        node = self.node_ids.get(int(asn))
+        if node is None:
+            return []
+        family_mask = FAMILIES[family]
+        result = []
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            edge_flags = self.flags[position]
+            if not edge_flags & family_mask:
+                continue
+            for flag, name in ((PROVIDER, "provider"), (CUSTOMER, "customer"), (PEER, "peer")):
+                if edge_flags & flag:
+                    result.append((self.nodes[self.targets[position]], name))
+        return result
+
+    def walk(self, asn, relations, family=None, max_hops=None):
+        """ Breadth first search from asn, return {node: hops} """
+        self.build()
+        start = self.node_ids.get(int(asn))
+        if start is None:
+            return {}
+        hops = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if max_hops is not None and hops[node] >= max_hops:
+                continue
+            for neighbor in self.neighbors(node, relations, family):
+                if neighbor not in hops:
+                    hops[neighbor] = hops[node] + 1
+                    queue.append(neighbor)
+        return hops
+
+    def customer_cone(self, asn, family=None):
+        """ ASNs reachable from asn going down customer links only, asn included """
+        return {self.nodes[node] for node in self.walk(asn, CUSTOMER, family)}
+
+    def k_hop(self, asn, k, relations=RELATIONS, family=None):
+        """ Return {ASN: hops} of every ASN at most k hops from asn """
+        return {self.nodes[node]: hops for node, hops in self.walk(asn, relations, family, k).items()}
+
+    def upstream_path(self, asn, target=None, family=None):
+        """ Shortest list of ASNs from asn up provider links to target.
+        target None = the closest ASN without a provider (transit free).
+        Return None when no such path exists.
+        """
+        self.build()
+        start = self.node_ids.get(int(asn))
+        goal = self.node_ids.get(int(target)) if target is not None else None
+        if start is None or (target is not None and goal is None):
+            return None
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            providers = list(self.neighbors(node, PROVIDER, family))
+            if node == goal or (goal is None and not providers):
+                path = []
+                while node is not None:
+                    path.append(self.nodes[node])
+                    node = parents[node]
+                return path[::-1]
+            for provider in providers:
+                if provider not in parents:
+                    parents[provider] = node
+                    queue.append(provider)
+        return None
+
+    def transit_dependency(self, asn, family=None):
+        """ Return {upstream ASN: share of upstream paths crossing it}, highest first.
+        Paths are all provider chains from asn up to a transit free ASN.
+        A share of 1.0 means every path needs that upstream. Provider loops
+        in bad data are cut where the walk meets an ASN already on its path.
+        """
+        self.build()
+        start = self.node_ids.get(int(asn))
+        if start is None:
+            return {}
+
+        """ Depth first walk up the provider links, children = providers kept for the counts """
+        children = {}
+        postorder = []
+        on_path = {start}
+        stack = [(start, iter(self.neighbors(start, PROVIDER, family)))]
+        children[start] = []
+        while stack:
+            node, providers = stack[-1]
+            for provider in providers:
+                if provider in on_path:
+                    continue
+                children[node].append(provider)
+                if provider not in children:
+                    children[provider] = []
+                    on_path.add(provider)
+                    stack.append((provider, iter(self.neighbors(provider, PROVIDER, family))))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(node)
+                postorder.append(node)
+
+        """ Paths from every upstream to the top, then paths from asn to every upstream """
+        paths_from = {}
+        for node in postorder:
+            paths_from[node] = sum(paths_from[child] for child in children[node]) or 1
+        paths_to = dict.fromkeys(children, 0)
+        paths_to[start] = 1
+        for node in reversed(postorder):
+            for child in children[node]:
+                paths_to[child] += paths_to[node]
+
+        total = paths_from[start]
+        shares = {self.nodes[node]: paths_to[node] * paths_from[node] / total
+                  for node in postorder if node != start}
+        return dict(sorted(shares.items(), key=lambda item: item[1], reverse=True))
+
+    def save(self, path):
+        """ Write the adjacency arrays to a binary file """
+        self.build()
+        with open(path, "wb") as graph_file:
+            graph_file.write(HEADER.pack(MAGIC, len(self.nodes), len(self.targets)))
+            self.nodes.tofile(graph_file)
+            self.offsets.tofile(graph_file)
+            self.targets.tofile(graph_file)
+            graph_file.write(self.flags)
+
+    @classmethod
+    def load(cls, path):
+        """ Read a graph written by save() """
+        graph = cls()
+        with open(path, "rb") as graph_file:
+            magic, node_count, edge_count = HEADER.unpack(graph_file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is NOT a bgpview AS graph")
+            graph.nodes.fromfile(graph_file, node_count)
+            graph.offsets = array("I")
+            graph.offsets.fromfile(graph_file, node_count + 1)
+            graph.targets.fromfile(graph_file, edge_count)
+            graph.flags = bytearray(graph_file.read(edge_count))
+        graph.node_ids = {asn: node for node, asn in enumerate(graph.nodes)}
+        return graph
+
+
+def graph_from_asns(asns, graph=None, workers=8, rate=5):
+    """ Query peers, upstreams and downstreams of every ASN and add them to the graph """
+    if graph is None:
+        graph = AsGraph()
+    for item in bulk_lookup(["peers", "upstreams", "downstreams"], asns, workers=workers, rate=rate):
+        if item.records:
+            graph.add_records(item.key, item.records)
+    graph.build()
+    return graph
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AS relationship graph queries")
+    parser.add_argument("--graph", help="Graph file written by --save, instead of querying the API")
+    parser.add_argument("--save", help="Write the graph to this file")
+    parser.add_argument("--start", type=int, default=0, help="First AS number of the range")
+    parser.add_argument("--end", type=int, default=65555, help="Stop before this AS number")
+    parser.add_argument("--keys", nargs="+", help="ASN list instead of a range")
+    parser.add_argument("--keys-file", help="File with one ASN per line")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--family", choices=["ipv4", "ipv6"], help="Only use links of this family")
+    parser.add_argument("--cone", type=int, action="append", default=[], help="Print the customer cone of this ASN")
+    parser.add_argument("--path", type=int, action="append", default=[], help="Print the upstream path of this ASN")
+    parser.add_argument("--dependency", type=int, action="append", default=[], help="Print the transit dependency of this ASN")
+    parser.add_argument("--hops", type=int, default=2, help="Hops for --neighborhood")
+    parser.add_argument("--neighborhood", type=int, action="append", default=[], help="Print ASNs within --hops of this ASN")
+    args = parser.parse_args(argv)
+
+    if args.graph:
+        graph = AsGraph.load(args.graph)
+    else:
+        graph = graph_from_asns(read_keys(args), workers=args.workers, rate=args.rate)
+    if args.save:
+        graph.save(args.save)
+    print(f"Graph: {len(graph)} ASNs, {len(graph.targets)} links")
+
+    for asn in args.cone:
+        cone = graph.customer_cone(asn, args.family)
+        print(f"AS{asn} customer cone ({len(cone)} ASNs): {sorted(cone)}")
+    for asn in args.path:
+        print(f"AS{asn} upstream path: {graph.upstream_path(asn, family=args.family)}")
+    for asn in args.dependency:
+        print(f"AS{asn} transit dependency: {graph.transit_dependency(asn, args.family)}")
+    for asn in args.neighborhood:
+        print(f"AS{asn} {args.hops} hop neighborhood: {graph.k_hop(asn, args.hops, family=args.family)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: ASN x Internet Exchange membership matrix.
+Load every IX once (RequestInternetExchange members, or RequestASNixs of
+some ASNs), then answer in memory: at which IXs do AS X and AS Y both
+peer and at what speed, which ASNs are the best peering candidates for
+AS X, and how much port capacity sits in every city.
+Every ASN has a bitset (a Python int) with one bit per IX column, so
+common IXs of two ASNs is one AND. Every port keeps its speed and
+IPv4/IPv6 addresses.
+
+Example: python bgpview_ix.py --ix-start 1 --ix-end 2000 --save ixs.json --common 6939 13335
+"""
+
+import argparse
+import json
+from collections import Counter, namedtuple
+
+from bgpview_bulk import bulk_lookup
+from bgpview_records import IxRecord
+
+""" One IX column of the matrix """
+IxInfo = namedtuple("IxInfo", ["ix_id", "name", "name_full", "city", "country"])
+
+
+def bit_positions(bits):
+    """ Yield the positions of the bits set in a Python int """
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
+
+class IxMatrix:
+    """ columns = {ix_id: column}, ixs = [IxInfo] by column
+    asn_bits = {asn: bitset of the IX columns the ASN is at}
+    ix_members = [set of ASNs] by column
+    ports = {(asn, column): [IxRecord]}, one IxRecord per port / router address
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self.ixs = []
+        self.asn_bits = {}
+        self.ix_members = []
+        self.ports = {}
+
+    def __len__(self):
+        """ Number of ASN x IX memberships """
+        return len(self.ports)
+
+    def column(self, ix_id, name=None, name_full=None, city=None, country=None):
+        """ Column of an IX, a new one for an IX never seen, details filled when missing """
+        column = self.columns.get(ix_id)
+        if column is None:
+            column = self.columns[ix_id] = len(self.ixs)
+            self.ixs.append(IxInfo(ix_id, name, name_full, city, country))
+            self.ix_members.append(set())
+        else:
+            info = self.ixs[column]
+            self.ixs[column] = IxInfo(ix_id, info.name or name, info.name_full or name_full,
+                                      info.city or city, info.country or country)
+        return column
+
+    def add_port(self, record, info=None):
+        """ Add one IxRecord (ix_id and asn set), info = IxInfo details of its IX """
+        if record.ix_id is None or record.asn is None:
+            return
+        if info is None:
+            info = IxInfo(record.ix_id, record.name, record.name_full, record.city, record.country)
+        column = self.column(record.ix_id, *info[1:])
+        asn = int(record.asn)
+        self.asn_bits[asn] = self.asn_bits.get(asn, 0) | (1 << column)
+        self.ix_members[column].add(asn)
+        ports = self.ports.setdefault((asn, column), [])
+        if all((port.ipv4_address, port.ipv6_address) != (record.ipv4_address, record.ipv6_address)
+               for port in ports):
+            ports.append(record)
+
+    def add_ix_detail(self, detail):
+        """ Add a RequestInternetExchange.get_records() answer, every member port """
+        info = IxInfo(detail.ix_id, detail.name, detail.name_full, detail.city, detail.country)
+        self.column(*info)
+        for record in detail.members:
+            self.add_port(record, info)
+
+    def add_asn_ixs(self, records):
+        """ Add a RequestASNixs.get_records() answer """
+        for record in records:
+            self.add_port(record)
+
+    def asn_ixs(self, asn):
+        """ Return [IxInfo] of every IX the ASN is at """
+        return [self.ixs[column] for column in bit_positions(self.asn_bits.get(int(asn), 0))]
+
+    def members(self, ix_id):
+        """ Return the sorted ASNs at one IX """
+        column = self.columns.get(ix_id)
+        return sorted(self.ix_members[column]) if column is not None else []
+
+    def common_ixs(self, asn, other_asn):
+        """ Return [(IxInfo, ports of asn, ports of other_asn)] of every IX both ASNs are at """
+        asn, other_asn = int(asn), int(other_asn)
+        bits = self.asn_bits.get(asn, 0) & self.asn_bits.get(other_asn, 0)
+        return [(self.ixs[column], self.ports[(asn, column)], self.ports[(other_asn, column)])
+                for column in bit_positions(bits)]
+
+    def common_count(self, asn, other_asn):
+        """ Number of IXs both ASNs are at, one AND and a bit count """
+        return bin(self.asn_bits.get(int(asn), 0) & self.asn_bits.get(int(other_asn), 0)).count("1")
+
+    def peering_candidates(self, asn, min_common=1, exclude=(), limit=None):
+        """ Return [(ASN, number of common IXs)] of ASNs sharing at least min_common IXs, most first.
+        exclude = ASNs to leave out, for example the current peers from RequestASNPeers
+        """
+        asn = int(asn)
+        counts = Counter()
+        for column in bit_positions(self.asn_bits.get(asn, 0)):
+            counts.update(self.ix_members[column])
+        counts.pop(asn, None)
+        for excluded in exclude:
+            counts.pop(int(excluded), None)
+        candidates = [(other, count) for other, count in counts.most_common() if count >= min_common]
+        return candidates[:limit] if limit is not None else candidates
+
+    def city_capacity(self, asn=None):
+        """ Return {(city, country): total port Mbps}, of one ASN or of every member """
+        if asn is not None:
+            asn = int(asn)
+            memberships = (((asn, column), self.ports[(asn, column)])
+                           for column in bit_positions(self.asn_bits.get(asn, 0)))
+        else:
+            memberships = self.ports.items()
+        capacity = Counter()
+        for (_, column), ports in memberships:
+            info = self.ixs[column]
+            capacity[(info.city, info.country)] += sum(port.speed or 0 for port in ports)
+        return dict(capacity.most_common())
+
+    def ix_capacity(self):
+        """ Return {ix_id: (members, total port Mbps)}, biggest first """
+        capacity = {}
+        for (_, column), ports in self.ports.items():
+            members, speed = capacity.get(column, (0, 0))
+            capacity[column] = (members + 1, speed + sum(port.speed or 0 for port in ports))
+        return {self.ixs[column].ix_id: value
+                for column, value in sorted(capacity.items(), key=lambda item: item[1][1], reverse=True)}
+
+    def save(self, path):
+        """ Write the IXs and ports to a JSON file """
+        with open(path, "w") as matrix_file:
+            json.dump({
+                "ixs": [list(info) for info in self.ixs],
+                "ports": [[port.ix_id, port.asn, port.ipv4_address, port.ipv6_address, port.speed]
+                          for ports in self.ports.values() for port in ports],
+            }, matrix_file)
+
+    @classmethod
+    def load(cls, path):
+        """ Read a matrix written by save() """
+        matrix = cls()
+        with open(path) as matrix_file:
+            data = json.load(matrix_file)
+        for info in data["ixs"]:
+            matrix.column(*info)
+        for ix_id, asn, ipv4_address, ipv6_address, speed in data["ports"]:
+            info = matrix.ixs[matrix.columns[ix_id]]
+            matrix.add_port(IxRecord(ix_id, asn, info.name, info.name_full, None, info.country, info.city,
+                                     ipv4_address, ipv6_address, speed), info)
+        return matrix
+
+
+def matrix_from_ixs(ix_ids, matrix=None, workers=8, rate=5):
+    """ Query the members of every IX in ix_ids and add them to the matrix """
+    if matrix is None:
+        matrix = IxMatrix()
+    for item in bulk_lookup(["ix"], ix_ids, workers=workers, rate=rate):
+        if item.records is not None:
+            matrix.add_ix_detail(item.records)
+    return matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ASN x IX membership queries")
+    parser.add_argument("--matrix", help="Matrix file written by --save, instead of querying the API")
+    parser.add_argument("--save", help="Write the matrix to this file")
+    parser.add_argument("--ix-start", type=int, default=1, help="First IX ID to load")
+    parser.add_argument("--ix-end", type=int, default=2000, help="Stop before this IX ID")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--common", type=int, nargs=2, metavar="ASN", help="Print the IXs both ASNs are at")
+    parser.add_argument("--candidates", type=int, help="Print the best peering candidates of this ASN")
+    parser.add_argument("--min-common", type=int, default=2, help="Common IXs a peering candidate needs")
+    parser.add_argument("--capacity", action="store_true", help="Print the port capacity per city")
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        matrix = IxMatrix.load(args.matrix)
+    else:
+        matrix = matrix_from_ixs(range(args.ix_start, args.ix_end), workers=args.workers, rate=args.rate)
+    if args.save:
+        matrix.save(args.save)
+    print(f"Matrix: {len(matrix.asn_bits)} ASNs, {len(matrix.ixs)} IXs, {len(matrix)} memberships")
+
+    if args.common:
+        asn, other_asn = args.common
+        for info, ports, other_ports in matrix.common_ixs(asn, other_asn):
+            print(f"<IX ID: {info.ix_id} -- Name: {info.name} -- Location: {info.city}, {info.country} -- "
+                  f"AS{asn} Speed: {sum(p.speed or 0 for p in ports)} -- "
+                  f"AS{other_asn} Speed: {sum(p.speed or 0 for p in other_ports)}>")
+    if args.candidates:
+        for other_asn, count in matrix.peering_candidates(args.candidates, args.min_common, limit=50):
+            print(f"<ASN: {other_asn} -- Common IXs: {count}>")
+    if args.capacity:
+        for (city, country), speed in matrix.city_capacity().items():
+            print(f"<Location: {city}, {country} -- Capacity: {speed} Mbps>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Append only journal of finished bulk queries.
+Every finished (lookup, key) is appended as one JSON line with its result
+and API answer. Lines are fsync'ed in batches, not one by one. A restarted
+sweep opens the same journal, skips the pairs already in it and replays
+their results, so a crash at ASN 40,000 costs at most the last batch.
+
+Example: python bgpview_bulk.py --lookup asn --journal sweep.journal --output asn.ndjson
+"""
+
+import json
+import os
+import time
+
+
+class SweepJournal:
+    """ done = {(lookup, str(key))} of every journaled query.
+    fsync_every = lines, fsync_interval = seconds between two fsync
+    """
+
+    def __init__(self, path, fsync_every=100, fsync_interval=1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.done = set()
+        """ Bytes of the journal written by the previous runs, replay() reads up to here """
+        self.replay_size = self.scan()
+        self.journal_file = open(path, "ab")
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def scan(self):
+        """ Load the done set, cut a last line a crash left half written """
+        if not os.path.exists(self.path):
+            return 0
+        good_size = 0
+        with open(self.path, "rb") as journal_file:
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.done.add((entry["lookup"], str(entry["key"])))
+                good_size += len(line)
+        if good_size != os.path.getsize(self.path):
+            print(f"===> ERROR: {self.path} ends with a broken line, it is removed <===")
+            with open(self.path, "r+b") as journal_file:
+                journal_file.truncate(good_size)
+        return good_size
+
+    def __contains__(self, lookup_key):
+        lookup, key = lookup_key
+        return (lookup, str(key)) in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    def record(self, lookup, key, result, data):
+        """ Append one finished query, fsync when the batch is full or old enough """
+        line = json.dumps({"lookup": lookup, "key": key, "result": result, "data": data}, default=str)
+        self.journal_file.write(line.encode() + b"\n")
+        self.done.add((lookup, str(key)))
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def replay(self):
+        """ Yield (lookup, key, result, data) of the queries journaled by the previous runs """
+        with open(self.path, "rb") as journal_file:
+            position = 0
+            for line in journal_file:
+                position += len(line)
+                if position > self.replay_size:
+                    break
+                entry = json.loads(line)
+                yield entry["lookup"], entry["key"], entry["result"], entry["data"]
+
+    def close(self):
+        if not self.journal_file.closed:
+            self.sync()
+            self.journal_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
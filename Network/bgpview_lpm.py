@@ -0,0 +1,152 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Local longest prefix match for IP addresses, IPv4 and IPv6.
+Load it with prefixes already collected by RequestASNprefixes.get_records()
+and RequestPrefix.get_records(), then answer IP -> prefix -> origin ASN in
+memory. IPResolver only calls the API (RequestIPAddress) when no loaded
+prefix covers the IP, and keeps what it learns for the next lookups.
+
+Instead of a bit by bit Patricia trie, every prefix length has its own hash
+table of network numbers. A lookup checks the lengths in use, longest first,
+so it costs one dict lookup per distinct prefix length. In pure Python that
+is much faster than walking a trie one bit at a time.
+"""
+
+import socket
+
+from bgpview_records import PrefixRecord
+from bgpview_v2 import RequestASNprefixes, RequestIPAddress
+
+API_URL = "https://api.bgpview.io/"
+BITS = {4: 32, 6: 128}
+
+
+def ip_to_int(ip):
+    """ Return (family, integer) of an IPv4 or IPv6 address string """
+    if ":" in ip:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+    return 4, int.from_bytes(socket.inet_aton(ip), "big")
+
+
+def prefix_to_int(prefix):
+    """ Return (family, network integer, prefix length) of "192.0.2.0/24" """
+    network, _, length = prefix.partition("/")
+    family, network_int = ip_to_int(network)
+    length = int(length) if length else BITS[family]
+    host_bits = BITS[family] - length
+    return family, network_int >> host_bits << host_bits, length
+
+
+class PrefixIndex:
+    """ Longest prefix match over IPv4 and IPv6 prefixes.
+    Values are usually PrefixRecord, anything can be stored.
+    """
+
+    def __init__(self):
+        """ tables[family][length] = {network >> host bits: value} """
+        self.tables = {4: {}, 6: {}}
+        """ Prefix lengths in use, longest first, with their table and host bits """
+        self.lengths = {4: [], 6: []}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, prefix, value):
+        """ Add or replace one prefix, "192.0.2.0/24" or "2001:db8::/32" """
+        family, network_int, length = prefix_to_int(prefix)
+        table = self.tables[family].get(length)
+        if table is None:
+            table = self.tables[family][length] = {}
+            host_bits = BITS[family] - length
+            self.lengths[family] = sorted(self.lengths[family] + [(length, host_bits, table)],
+                                          key=lambda item: item[0], reverse=True)
+        key = network_int >> (BITS[family] - length)
+        if key not in table:
+            self.count += 1
+        table[key] = value
+
+    def add_records(self, records):
+        """ Add PrefixRecord objects, RequestASNprefixes.get_records() or IPDetail.prefixes.
+        Records without a valid prefix are skipped.
+        """
+        for record in records:
+            if record.prefix is not None:
+                try:
+                    self.add(record.prefix, record)
+                except (OSError, ValueError):
+                    print(f"===> ERROR: {record.prefix} is NOT a valid prefix. <===")
+
+    def add_prefix_detail(self, detail):
+        """ Add a RequestPrefix.get_records() answer, one value per prefix with its first origin ASN """
+        origin = detail.asns[0] if detail.asns else None
+        self.add(detail.prefix, PrefixRecord(
+            detail.prefix, None, origin.asn if origin else None, detail.name,
+            detail.description, detail.country, None,
+            origin.description if origin else None, origin.country if origin else None))
+
+    def lookup_int(self, family, ip_int):
+        """ Longest match for an address integer, None when nothing covers it """
+        for length, host_bits, table in self.lengths[family]:
+            value = table.get(ip_int >> host_bits)
+            if value is not None:
+                return value
+        return None
+
+    def lookup(self, ip):
+        """ Longest match for an address string, None when nothing covers it """
+        family, ip_int = ip_to_int(ip)
+        return self.lookup_int(family, ip_int)
+
+    def covering(self, ip):
+        """ Every stored value covering the IP, longest prefix first """
+        family, ip_int = ip_to_int(ip)
+        matches = []
+        for length, host_bits, table in self.lengths[family]:
+            value = table.get(ip_int >> host_bits)
+            if value is not None:
+                matches.append(value)
+        return matches
+
+
+def index_from_asns(asns, index=None):
+    """ Build a PrefixIndex from the prefixes announced by every ASN in asns """
+    if index is None:
+        index = PrefixIndex()
+    for asn in asns:
+        records = RequestASNprefixes(API_URL, asn).get_records()
+        if records:
+            index.add_records(records)
+    return index
+
+
+class IPResolver:
+    """ IP -> PrefixRecord from the local index, RequestIPAddress only on a miss """
+
+    def __init__(self, index=None):
+        self.index = index if index is not None else PrefixIndex()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, ip):
+        record = self.index.lookup(ip)
+        if record is not None:
+            self.hits += 1
+            return record
+
+        self.misses += 1
+        detail = RequestIPAddress(API_URL, ip).get_records()
+        if detail is None or not detail.prefixes:
+            return None
+        self.index.add_records(detail.prefixes)
+        return self.index.lookup(ip)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "prefixes": len(self.index),
+        }
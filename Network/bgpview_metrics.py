@@ -0,0 +1,183 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Metrics of the BGPView client: latency per endpoint, bytes, retries,
+errors, cache hits, JSON decode time and getter parse time. Nothing is
+measured until a sink is set, then every Request* object reports to it
+
+    RequestBGPapi.metrics = Metrics()
+
+Metrics keeps counters and histograms in memory and writes them in the
+Prometheus text format, for node_exporter's textfile collector or to read
+by hand. Any object with the increment() and observe() methods of
+MetricsSink can be used instead, for example to forward to statsd.
+
+Example: python bgpview_bulk.py --start 0 --end 1000 --metrics-file bgpview.prom
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+""" Upper bounds in seconds, from a JSON decode to a slow API answer """
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+""" name = (type, help) of every metric the client reports """
+METRICS = {
+    "bgpview_request_seconds": ("histogram", "Time of one HTTP request to the API, retries apart"),
+    "bgpview_requests_total": ("counter", "HTTP requests sent to the API by status code"),
+    "bgpview_response_bytes_total": ("counter", "Bytes of API answers received"),
+    "bgpview_retries_total": ("counter", "Requests sent again after a failure"),
+    "bgpview_errors_total": ("counter", "Requests that raised an exception, by exception"),
+    "bgpview_failures_total": ("counter", "Queries that failed every try"),
+    "bgpview_decode_seconds": ("histogram", "Time to decode the JSON of one answer"),
+    "bgpview_parse_seconds": ("histogram", "Time of a getter building its records and strings, fetch apart"),
+    "bgpview_cache_lookups_total": ("counter", "Response cache and result memo lookups by result"),
+    "bgpview_lookup_seconds": ("histogram", "Time of one bulk lookup, rate limit wait included"),
+}
+
+""" Gauges computed from bgpview_cache_lookups_total when the metrics are written """
+CACHE_HIT_RATIO = "bgpview_cache_hit_ratio"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels, extra=None):
+    """ (("endpoint", "asn"),) = '{endpoint="asn"}' """
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+
+class MetricsSink:
+    """ Interface of RequestBGPapi.metrics, this one drops everything.
+    labels = keyword arguments, for example endpoint="asn/prefixes"
+    """
+
+    def increment(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+
+class Metrics(MetricsSink):
+    """ Thread safe counters and histograms kept in memory.
+    counters = {(name, labels): value}
+    histograms = {(name, labels): [bucket counts..., +Inf count, sum]}
+    labels = sorted tuple of (label, value)
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def increment(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        position = bisect_left(self.buckets, value)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(self.buckets) + 2)
+            histogram[position] += 1
+            histogram[-1] += value
+
+    def counter(self, name, **labels):
+        """ Sum of a counter over every label set matching labels """
+        with self.lock:
+            return sum(value for (counter_name, counter_labels), value in self.counters.items()
+                       if counter_name == name and set(labels.items()) <= set(counter_labels))
+
+    def cache_hit_ratios(self):
+        """ Return {cache: hits / lookups} from bgpview_cache_lookups_total """
+        lookups = {}
+        with self.lock:
+            for (name, labels), value in self.counters.items():
+                if name != "bgpview_cache_lookups_total":
+                    continue
+                labels = dict(labels)
+                hits, total = lookups.get(labels["cache"], (0, 0))
+                lookups[labels["cache"]] = (hits + (value if labels["result"] == "hit" else 0), total + value)
+        return {cache: hits / total for cache, (hits, total) in sorted(lookups.items()) if total}
+
+    def summary(self):
+        """ Return {name: {"count", "sum", "average"}} of every histogram, all label sets added up """
+        totals = {}
+        with self.lock:
+            for (name, _), histogram in self.histograms.items():
+                count, total = totals.get(name, (0, 0.0))
+                totals[name] = (count + sum(histogram[:-1]), total + histogram[-1])
+        return {name: {"count": count, "sum": total, "average": total / count if count else 0.0}
+                for name, (count, total) in sorted(totals.items())}
+
+    def prometheus_text(self):
+        """ Every metric in the Prometheus text exposition format """
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, list(histogram)) for key, histogram in self.histograms.items())
+
+        lines = []
+        last_name = None
+        for (name, labels), value in counters:
+            if name != last_name:
+                lines.append(f"# HELP {name} {METRICS.get(name, ('counter', name))[1]}")
+                lines.append(f"# TYPE {name} counter")
+                last_name = name
+            lines.append(f"{name}{format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            if name != last_name:
+                lines.append(f"# HELP {name} {METRICS.get(name, ('histogram', name))[1]}")
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels(labels, ('le', bound))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram[-1]}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+
+        ratios = self.cache_hit_ratios()
+        if ratios:
+            lines.append(f"# HELP {CACHE_HIT_RATIO} Hits of bgpview_cache_lookups_total over all lookups")
+            lines.append(f"# TYPE {CACHE_HIT_RATIO} gauge")
+            for cache, ratio in ratios.items():
+                lines.append(f"{CACHE_HIT_RATIO}{format_labels((('cache', cache),))} {ratio}")
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path):
+        """ Write the metrics to path, through a temp file so a reader never sees half of it """
+        with open(f"{path}.tmp", "w") as metrics_file:
+            metrics_file.write(self.prometheus_text())
+        os.replace(f"{path}.tmp", path)
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+def dump_while(results, metrics, path, interval=10):
+    """ Yield every item of results and rewrite the metrics file every interval
+    seconds, and once more at the end
+    """
+    next_dump = time.monotonic() + interval
+    try:
+        for item in results:
+            yield item
+            if time.monotonic() >= next_dump:
+                metrics.dump_prometheus(path)
+                next_dump = time.monotonic() + interval
+    finally:
+        metrics.dump_prometheus(path)
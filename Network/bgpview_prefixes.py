@@ -0,0 +1,234 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Prefix aggregation and overlap analysis over the prefixes of many ASNs.
+Every prefix is parsed once into integer columns, first address, last address,
+prefix length and origin ASN, IPv4 and IPv6 apart. One sort of packed
+integer keys orders a whole family, then single passes over the columns
+collapse adjacent and covered prefixes, add up the address space of every
+ASN and find the prefixes two ASNs both announce (MOAS) or that cover a
+prefix of another ASN. No ipaddress objects are built, so a transit
+provider with tens of thousands of prefixes takes well under a second.
+
+Example: python bgpview_prefixes.py 6939 13335 15169 --aggregate --conflicts
+"""
+
+import argparse
+import socket
+from array import array
+from collections import namedtuple
+
+from bgpview_bulk import bulk_lookup
+from bgpview_lpm import BITS, prefix_to_int
+
+""" kind = "moas" when both ASNs announce the same prefix, "overlap" when
+other_prefix of other_asn covers prefix of asn
+"""
+Conflict = namedtuple("Conflict", ["kind", "prefix", "asn", "other_prefix", "other_asn"])
+
+""" Bits of the row number in a packed sort key """
+ROW_BITS = 32
+
+
+def int_to_prefix(family, network_int, length):
+    """ Return "192.0.2.0/24" of a network integer and prefix length """
+    if family == 6:
+        return f"{socket.inet_ntop(socket.AF_INET6, network_int.to_bytes(16, 'big'))}/{length}"
+    return f"{socket.inet_ntoa(network_int.to_bytes(4, 'big'))}/{length}"
+
+
+def range_to_prefixes(family, start, end):
+    """ Return the fewest prefixes covering exactly the addresses start to end """
+    bits = BITS[family]
+    prefixes = []
+    while start <= end:
+        size = start & -start if start else 1 << bits
+        while size > end - start + 1:
+            size >>= 1
+        prefixes.append(int_to_prefix(family, start, bits - size.bit_length() + 1))
+        start += size
+    return prefixes
+
+
+class PrefixTable:
+    """ Prefixes as parallel integer columns, one set of columns per family.
+    starts, ends = first and last address, array('I') for IPv4 and lists of
+    Python ints for IPv6 (128 bits do not fit an array)
+    lengths = prefix lengths, asns = origin ASN, 0 when unknown
+    """
+
+    def __init__(self):
+        self.starts = {4: array("I"), 6: []}
+        self.ends = {4: array("I"), 6: []}
+        self.lengths = {4: array("B"), 6: array("B")}
+        self.asns = {4: array("I"), 6: array("I")}
+        self.seen = set()
+        """ Row numbers sorted by first address then prefix length, rebuilt after add() """
+        self.sorted_rows = {4: None, 6: None}
+
+    def __len__(self):
+        return len(self.seen)
+
+    def add(self, prefix, asn):
+        """ Add one prefix announced by asn, the same prefix and ASN twice is kept once """
+        family, network_int, length = prefix_to_int(prefix)
+        asn = int(asn or 0)
+        if (family, network_int, length, asn) in self.seen:
+            return
+        self.seen.add((family, network_int, length, asn))
+        self.starts[family].append(network_int)
+        self.ends[family].append(network_int | ((1 << (BITS[family] - length)) - 1))
+        self.lengths[family].append(length)
+        self.asns[family].append(asn)
+        self.sorted_rows[family] = None
+
+    def add_records(self, records):
+        """ Add PrefixRecord objects, RequestASNprefixes.get_records() or IPDetail.prefixes.
+        Records without a valid prefix are skipped.
+        """
+        for record in records:
+            if record.prefix is not None:
+                try:
+                    self.add(record.prefix, record.asn)
+                except (OSError, ValueError):
+                    print(f"===> ERROR: {record.prefix} is NOT a valid prefix. <===")
+
+    def rows(self, family):
+        """ Row numbers in address order, a covering prefix before the prefixes it covers.
+        (start, length, row) is packed into one int per row, so the sort compares plain ints.
+        """
+        if self.sorted_rows[family] is None:
+            starts, lengths = self.starts[family], self.lengths[family]
+            mask = (1 << ROW_BITS) - 1
+            keys = sorted((((start << 8) | length) << ROW_BITS) | row
+                          for row, (start, length) in enumerate(zip(starts, lengths)))
+            self.sorted_rows[family] = array("I", [key & mask for key in keys])
+        return self.sorted_rows[family]
+
+    def prefix(self, family, row):
+        return int_to_prefix(family, self.starts[family][row], self.lengths[family][row])
+
+    def collapse(self, family, asn=None):
+        """ Return [(start, end)] of the address ranges announced, of one ASN or of all.
+        Adjacent and covered prefixes end up in one range.
+        """
+        starts, ends, asns = self.starts[family], self.ends[family], self.asns[family]
+        ranges = []
+        current_start = current_end = None
+        for row in self.rows(family):
+            if asn is not None and asns[row] != asn:
+                continue
+            start = starts[row]
+            if current_end is not None and start <= current_end + 1:
+                if ends[row] > current_end:
+                    current_end = ends[row]
+                continue
+            if current_end is not None:
+                ranges.append((current_start, current_end))
+            current_start, current_end = start, ends[row]
+        if current_end is not None:
+            ranges.append((current_start, current_end))
+        return ranges
+
+    def aggregate(self, family, asn=None):
+        """ Return the fewest prefixes covering the same addresses, of one ASN or of all """
+        return [prefix for start, end in self.collapse(family, asn)
+                for prefix in range_to_prefixes(family, start, end)]
+
+    def address_space(self, family):
+        """ Return {asn: addresses announced}, overlapping prefixes of one ASN counted once.
+        One pass in address order, every ASN keeps its own open range.
+        """
+        starts, ends, asns = self.starts[family], self.ends[family], self.asns[family]
+        open_ranges = {}
+        space = {}
+        for row in self.rows(family):
+            asn, start, end = asns[row], starts[row], ends[row]
+            current = open_ranges.get(asn)
+            if current is not None and start <= current[1] + 1:
+                if end > current[1]:
+                    open_ranges[asn] = (current[0], end)
+                continue
+            if current is not None:
+                space[asn] = space.get(asn, 0) + current[1] - current[0] + 1
+            open_ranges[asn] = (start, end)
+        for asn, (start, end) in open_ranges.items():
+            space[asn] = space.get(asn, 0) + end - start + 1
+        return space
+
+    def moas(self, family):
+        """ Return {prefix: sorted ASNs} of the prefixes more than one ASN announces """
+        starts, lengths, asns = self.starts[family], self.lengths[family], self.asns[family]
+        origins = {}
+        for row in range(len(asns)):
+            origins.setdefault((starts[row], lengths[row]), []).append(asns[row])
+        return {int_to_prefix(family, start, length): sorted(prefix_asns)
+                for (start, length), prefix_asns in sorted(origins.items()) if len(prefix_asns) > 1}
+
+    def conflicts(self, family):
+        """ Yield a Conflict for every prefix that another ASN also announces or covers.
+        Two prefixes are either nested or apart, so in address order the prefixes
+        still open on a stack are exactly the ones covering the current row.
+        """
+        starts, ends, lengths, asns = self.starts[family], self.ends[family], self.lengths[family], self.asns[family]
+        stack = []
+        for row in self.rows(family):
+            start = starts[row]
+            while stack and ends[stack[-1]] < start:
+                stack.pop()
+            asn = asns[row]
+            for other in stack:
+                other_asn = asns[other]
+                if other_asn == asn:
+                    continue
+                if starts[other] == start and lengths[other] == lengths[row]:
+                    yield Conflict("moas", self.prefix(family, row), asn, self.prefix(family, other), other_asn)
+                else:
+                    yield Conflict("overlap", self.prefix(family, row), asn, self.prefix(family, other), other_asn)
+            stack.append(row)
+
+    def summary(self):
+        """ Return {asn: (IPv4 addresses, IPv6 addresses)} announced by every ASN """
+        ipv4_space = self.address_space(4)
+        ipv6_space = self.address_space(6)
+        return {asn: (ipv4_space.get(asn, 0), ipv6_space.get(asn, 0))
+                for asn in sorted(set(ipv4_space) | set(ipv6_space))}
+
+
+def table_from_asns(asns, table=None, workers=8, rate=5):
+    """ Query the prefixes of every ASN in asns and add them to the table """
+    if table is None:
+        table = PrefixTable()
+    for item in bulk_lookup(["prefixes"], asns, workers=workers, rate=rate):
+        if item.records:
+            table.add_records(item.records)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate and compare the prefixes of ASNs")
+    parser.add_argument("asns", nargs="+", type=int, help="ASNs to load the prefixes of")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--aggregate", action="store_true", help="Print the aggregated prefixes of every ASN")
+    parser.add_argument("--conflicts", action="store_true", help="Print MOAS and overlapping prefixes between ASNs")
+    args = parser.parse_args(argv)
+
+    table = table_from_asns(args.asns, workers=args.workers, rate=args.rate)
+    print(f"Prefixes: {len(table)}")
+
+    for asn, (ipv4_space, ipv6_space) in table.summary().items():
+        print(f"<ASN: {asn} -- IPv4 Addresses: {ipv4_space} -- IPv6 /48s: {ipv6_space >> 80}>")
+        if args.aggregate:
+            for family in (4, 6):
+                for prefix in table.aggregate(family, asn):
+                    print(f"    {prefix}")
+    if args.conflicts:
+        for family in (4, 6):
+            for conflict in table.conflicts(family):
+                print(f"<{conflict.kind.upper()}: {conflict.prefix} AS{conflict.asn} -- "
+                      f"{conflict.other_prefix} AS{conflict.other_asn}>")
+
+
+if __name__ == "__main__":
+    main()
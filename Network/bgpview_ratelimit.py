@@ -0,0 +1,144 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Token bucket rate limiter shared by every thread that calls
+the BGPView API, so a bulk sweep never goes over the API request rate.
+Give it a state_file and it is also shared by every process using the same
+file. The rate adapts: it is cut in half when the API answers HTTP 429 and
+grows back step by step while requests succeed.
+Also the exponential backoff with jitter used between retries.
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """ Allow "rate" requests per second with bursts up to "capacity".
+    Call acquire() before every API request, it blocks until a token is free,
+    or await acquire_async() on an event loop.
+    state_file = path shared by several processes, None for this process only
+    min_rate = lowest rate slow_down() goes to
+    """
+
+    def __init__(self, rate, capacity=None, state_file=None, min_rate=0.2):
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than 0, got {rate}")
+        self.max_rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.last_refill = time.time()
+        self.state_file = state_file
+        self.lock = threading.Lock()
+
+    def refill(self):
+        """ Add the tokens earned since the last refill """
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def update(self, change):
+        """ Run change() on the bucket, under the file lock when the state is shared.
+        fcntl is only imported for a state_file, it does not exist on Windows.
+        """
+        with self.lock:
+            if self.state_file is None:
+                return change()
+
+            import fcntl
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                state = os.read(fd, 128).split()
+                if len(state) == 3:
+                    self.tokens, self.last_refill, self.rate = (float(x) for x in state)
+                result = change()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, f"{self.tokens} {self.last_refill} {self.rate}".encode())
+                return result
+            finally:
+                os.close(fd)
+
+    def take(self, tokens=1):
+        """ Take tokens when there are enough, return 0, else the seconds to wait """
+        def change():
+            self.refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+        return self.update(change)
+
+    def acquire(self, tokens=1):
+        """ Take tokens from the bucket, sleep until there are enough """
+        while True:
+            wait_time = self.take(tokens)
+            if wait_time == 0:
+                return
+            time.sleep(wait_time)
+
+    async def run_async(self, method, *args):
+        """ Call a bucket method from an event loop. With a state_file it locks
+        and reads a file, so it runs in the default thread pool.
+        """
+        if self.state_file is None:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def acquire_async(self, tokens=1):
+        """ acquire() for asyncio, waits without blocking the event loop """
+        while True:
+            wait_time = await self.run_async(self.take, tokens)
+            if wait_time == 0:
+                return
+            await asyncio.sleep(wait_time)
+
+    def slow_down(self):
+        """ API answered 429, cut the rate in half and empty the bucket """
+        def change():
+            self.refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+        self.update(change)
+
+    def speed_up(self):
+        """ Request succeeded, grow the rate back by 5% of the max rate """
+        if self.rate >= self.max_rate:
+            return
+
+        def change():
+            self.refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+        self.update(change)
+
+
+def parse_retry_after(value):
+    """ Retry-After header as seconds, it is either seconds or an HTTP date """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_date.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(query_try, retry_after=None, base=0.5, cap=60.0):
+    """ Seconds to wait before the next try.
+    Full jitter exponential backoff: random between 0 and base * 2^(try - 1),
+    never more than cap. A Retry-After from the server always wins.
+    """
+    if retry_after is not None:
+        return min(retry_after, cap) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** (query_try - 1)))
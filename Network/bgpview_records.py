@@ -0,0 +1,177 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Typed records for BGPView API answers. The Request* getters in
+bgpview_v2.py fill these records first and build their formatted strings
+from them, get_records() returns the records without any string parsing.
+"""
+
+from dataclasses import dataclass, field, fields, asdict
+
+
+def slotted(cls):
+    """ Same as @dataclass(slots=True), which needs Python 3.10: build the
+    dataclass again with __slots__ of its fields. The generated __init__
+    holds the defaults, so the class attributes of the fields are dropped.
+    """
+    names = tuple(record_field.name for record_field in fields(cls))
+    body = {key: value for key, value in vars(cls).items()
+            if key not in names and key not in ("__dict__", "__weakref__")}
+    body["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, body)
+
+
+@slotted
+@dataclass
+class AsnInfo:
+    """ RequestASN, one AS number """
+    asn: int
+    name: str = None
+    description: str = None
+    country: str = None
+    date_allocated: str = None
+    date_updated: str = None
+    rir_allocation_status: str = None
+    iana_assignment_status: str = None
+
+
+@slotted
+@dataclass
+class AsnRecord:
+    """ RequestASNPeers, RequestANSupstreams, RequestASNdownstreams and search ASNs.
+    relation = "peer", "upstream", "downstream" or "search"
+    family = "ipv4" or "ipv6", None for search
+    """
+    asn: int
+    name: str = None
+    description: str = None
+    country: str = None
+    relation: str = None
+    family: str = None
+
+
+@slotted
+@dataclass
+class PrefixRecord:
+    """ RequestASNprefixes, RequestIPAddress and search prefixes
+    asn_description, asn_country = origin ASN details, RequestIPAddress only
+    """
+    prefix: str
+    parent: str = None
+    asn: int = None
+    name: str = None
+    description: str = None
+    country: str = None
+    family: str = None
+    asn_description: str = None
+    asn_country: str = None
+
+
+@slotted
+@dataclass
+class IxRecord:
+    """ RequestASNixs (one IX of an ASN) and RequestInternetExchange members
+    speed = port speed in Mbps, None when the API has 0 or nothing
+    """
+    ix_id: int = None
+    asn: int = None
+    name: str = None
+    name_full: str = None
+    description: str = None
+    country: str = None
+    city: str = None
+    ipv4_address: str = None
+    ipv6_address: str = None
+    speed: int = None
+
+
+@slotted
+@dataclass
+class PrefixDetail:
+    """ RequestPrefix, one prefix and the ASNs announcing it """
+    prefix: str
+    name: str = None
+    description: str = None
+    country: str = None
+    date_allocated: str = None
+    asns: list = field(default_factory=list)
+
+
+@slotted
+@dataclass
+class IPDetail:
+    """ RequestIPAddress, prefixes covering one IP, PrefixRecord.asn is the origin """
+    ip: str
+    prefixes: list = field(default_factory=list)
+
+
+@slotted
+@dataclass
+class IxDetail:
+    """ RequestInternetExchange, one IX and its members as IxRecord """
+    ix_id: int
+    name: str = None
+    name_full: str = None
+    city: str = None
+    country: str = None
+    members_count: int = None
+    members: list = field(default_factory=list)
+
+
+@slotted
+@dataclass
+class SearchResult:
+    """ RequestBGPSearch """
+    query: str
+    asns: list = field(default_factory=list)
+    ipv4_prefixes: list = field(default_factory=list)
+    ipv6_prefixes: list = field(default_factory=list)
+    internet_exchanges: list = field(default_factory=list)
+
+
+""" Single pass extractors, one dict lookup per field and no stale values
+from the previous line when a key is missing """
+
+
+def speed_mbps(speed):
+    """ API sends 0, "0" or None for an unknown port speed """
+    if speed == 0 or speed == "0":
+        return None
+    return speed
+
+
+def asn_record(line, relation=None, family=None):
+    """ Peer, upstream, downstream, prefix origin or search ASN """
+    get = line.get
+    return AsnRecord(get("asn"), get("name"), get("description"), get("country_code"), relation, family)
+
+
+def prefix_record(line, family=None, asn=None):
+    """ ASN prefix or search prefix, "parent" is {"prefix": ...} or missing """
+    get = line.get
+    parent = get("parent")
+    if parent is not None:
+        parent = parent.get("prefix")
+    return PrefixRecord(get("prefix"), parent, asn, get("name"), get("description"),
+                        get("country_code"), family)
+
+
+def ip_prefix_record(line):
+    """ Prefix covering an IP, "asn" is the origin {"asn", "description", "country_code"} """
+    get = line.get
+    origin = get("asn") or {}
+    return PrefixRecord(get("prefix"), None, origin.get("asn"), get("name"), get("description"),
+                        get("country_code"), None, origin.get("description"), origin.get("country_code"))
+
+
+def ix_record(line, ix_id=None, asn=None):
+    """ IX of an ASN (has ix_id) or member of an IX (has asn) """
+    get = line.get
+    return IxRecord(get("ix_id", ix_id), get("asn", asn), get("name"), get("name_full"),
+                    get("description"), get("country_code"), get("city"),
+                    get("ipv4_address"), get("ipv6_address"), speed_mbps(get("speed")))
+
+
+def record_to_dict(record):
+    """ Plain dict of a record, nested records included """
+    return asdict(record)
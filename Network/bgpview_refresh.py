@@ -0,0 +1,157 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Incremental refresh of the ASN registry.
+Every run queries /asn/as_number for each ASN (one request), compares its
+date_updated with the value saved by the previous run, and only re-queries
+prefixes, peers, upstreams, downstreams and IXs for ASNs that changed, are
+new, or were last refreshed more than --max-age days ago.
+
+Run it without a ResponseCache, or with a short "asn" TTL, otherwise the
+cached /asn answers hide the date_updated changes.
+
+Example: python bgpview_refresh.py --state bgpview_refresh.db --output daily.ndjson
+"""
+
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from bgpview_bulk import bulk_lookup, read_keys
+from bgpview_export import open_writer, export_results, EXPORT_FORMATS
+from bgpview_ratelimit import TokenBucket
+
+DAY = 86400
+DETAIL_LOOKUPS = ["prefixes", "peers", "upstreams", "downstreams", "ixs"]
+
+
+class RefreshState:
+    """ Last seen date_updated and last full refresh time per ASN, SQLite backed """
+
+    def __init__(self, path="bgpview_refresh.db"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS asns (
+                               asn INTEGER PRIMARY KEY,
+                               date_updated TEXT,
+                               refreshed REAL)""")
+        self.db.commit()
+
+    def get(self, asn):
+        """ Return (date_updated, refreshed time), (None, None) for an ASN never refreshed """
+        with self.lock:
+            row = self.db.execute("SELECT date_updated, refreshed FROM asns WHERE asn = ?", (int(asn),)).fetchone()
+        return row if row is not None else (None, None)
+
+    def needs_refresh(self, asn, date_updated, max_age=7 * DAY, now=None):
+        """ True when the ASN is new, its date_updated changed or its refresh is older than max_age """
+        last_updated, refreshed = self.get(asn)
+        if refreshed is None or last_updated != date_updated:
+            return True
+        return (now or time.time()) - refreshed > max_age
+
+    def mark(self, items, now=None):
+        """ Save [(asn, date_updated)] as refreshed now, in one transaction """
+        now = now or time.time()
+        with self.lock:
+            self.db.executemany("INSERT OR REPLACE INTO asns (asn, date_updated, refreshed) VALUES (?, ?, ?)",
+                                [(int(asn), date_updated, now) for asn, date_updated in items])
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            count, oldest = self.db.execute("SELECT COUNT(*), MIN(refreshed) FROM asns").fetchone()
+        return {"asns": count, "oldest_refresh": oldest}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def refresh(keys, state, lookups=None, max_age=7 * DAY, workers=8, rate=5, limiter=None, counts=None):
+    """ Yield bgpview_bulk.BulkResult for the ASN queries, then for the detail
+    lookups of the ASNs that need a refresh.
+    keys = ASNs to check, state = RefreshState, lookups = detail LOOKUPS names
+    counts = optional dict, filled with "checked", "changed" and "refreshed"
+    An ASN is marked refreshed only when all its detail lookups answered.
+    """
+    lookups = lookups or DETAIL_LOOKUPS
+    if limiter is None and rate is not None:
+        limiter = TokenBucket(rate)
+    if counts is None:
+        counts = {}
+    counts.update(checked=0, changed=0, refreshed=0)
+
+    """ Stage 1, one /asn query per ASN to read date_updated """
+    changed = {}
+    now = time.time()
+    for item in bulk_lookup(["asn"], keys, workers=workers, rate=rate, limiter=limiter):
+        counts["checked"] += 1
+        yield item
+        if item.records is None:
+            continue
+        date_updated = item.records.date_updated
+        if state.needs_refresh(item.key, date_updated, max_age, now):
+            changed[item.key] = date_updated
+    counts["changed"] = len(changed)
+
+    """ Stage 2, detail lookups for the changed ASNs only """
+    failed = set()
+    for item in bulk_lookup(lookups, list(changed), workers=workers, rate=rate, limiter=limiter):
+        if item.data is None:
+            failed.add(item.key)
+        yield item
+
+    done = [(asn, date_updated) for asn, date_updated in changed.items() if asn not in failed]
+    state.mark(done)
+    counts["refreshed"] = len(done)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh only the ASNs changed since the last run")
+    parser.add_argument("--state", default="bgpview_refresh.db", help="SQLite file with the last seen date_updated")
+    parser.add_argument("--lookup", action="append", choices=DETAIL_LOOKUPS,
+                        help="Detail lookup for changed ASNs, repeat for more (default: all)")
+    parser.add_argument("--max-age", type=float, default=7, help="Refresh unchanged ASNs after this many days")
+    parser.add_argument("--start", type=int, default=0, help="First AS number of the range")
+    parser.add_argument("--end", type=int, default=65555, help="Stop before this AS number")
+    parser.add_argument("--keys", nargs="+", help="ASN list instead of a range")
+    parser.add_argument("--keys-file", help="File with one ASN per line")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+    parser.add_argument("--rate-file", help="Share the request rate with other processes using this file")
+    parser.add_argument("--output", help="Stream records to this file instead of printing results")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output extension)")
+    args = parser.parse_args(argv)
+
+    start_time = datetime.now()
+    state = RefreshState(args.state)
+    limiter = TokenBucket(args.rate, state_file=args.rate_file)
+    counts = {}
+    results = refresh(read_keys(args), state, args.lookup, args.max_age * DAY,
+                      workers=args.workers, limiter=limiter, counts=counts)
+
+    try:
+        if args.output:
+            writer = open_writer(args.output, args.format)
+            try:
+                export_results(results, writer)
+            finally:
+                writer.close()
+        else:
+            for item in results:
+                print(f"{item.lookup} {item.key}: {item.result}")
+    finally:
+        state.close()
+
+    print(f"Checked {counts['checked']} ASNs, {counts['changed']} changed, {counts['refreshed']} refreshed, "
+          f"Running Time: {datetime.now() - start_time}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Interval index of reserved, private and documentation AS numbers.
+RequestASN and bgpview_bulk answer ASNs in these ranges locally instead of
+spending an API request to learn they are not real networks.
+The built in ranges come from the IANA special purpose AS numbers registry,
+more ranges (unallocated blocks, local policy) can be loaded from a file:
+
+    # start[-end] kind description
+    64512-65534 private Private AS Number (RFC6996)
+    153914-196607 unallocated Unallocated AS Number
+"""
+
+from bisect import bisect_right
+
+""" (start, end, kind, description), end included """
+BUILTIN_RANGES = [
+    (0, 0, "reserved", "Reserved AS Number (RFC7607)"),
+    (23456, 23456, "as_trans", "AS_TRANS (RFC6793)"),
+    (64496, 64511, "documentation", "Documentation AS Number (RFC5398)"),
+    (64512, 65534, "private", "Private AS Number (RFC6996)"),
+    (65535, 65535, "reserved", "Reserved AS Number (RFC7300)"),
+    (65536, 65551, "documentation", "Documentation AS Number (RFC5398)"),
+    (65552, 131071, "reserved", "Reserved AS Number (IANA)"),
+    (4200000000, 4294967294, "private", "Private AS Number (RFC6996)"),
+    (4294967295, 4294967295, "reserved", "Reserved AS Number (RFC7300)"),
+]
+
+
+class ReservedAsnIndex:
+    """ Sorted, non overlapping ASN ranges, lookup is a binary search.
+    A range added later replaces the part of older ranges it overlaps.
+    """
+
+    def __init__(self, ranges=None, builtin=True):
+        self.starts = []
+        self.ranges = []
+        if builtin:
+            self.add_ranges(BUILTIN_RANGES)
+        if ranges:
+            self.add_ranges(ranges)
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def add(self, start, end, kind, description=None):
+        """ Add the range start-end (end included), cut older ranges it overlaps """
+        start, end = int(start), int(end)
+        if start > end:
+            raise ValueError(f"ASN range {start}-{end} ends before it starts")
+        kept = []
+        for old_start, old_end, old_kind, old_description in self.ranges:
+            if old_end < start or old_start > end:
+                kept.append((old_start, old_end, old_kind, old_description))
+                continue
+            if old_start < start:
+                kept.append((old_start, start - 1, old_kind, old_description))
+            if old_end > end:
+                kept.append((end + 1, old_end, old_kind, old_description))
+        kept.append((start, end, kind, description or f"{kind.capitalize()} AS Number"))
+        kept.sort()
+        self.ranges = kept
+        self.starts = [item[0] for item in kept]
+
+    def add_ranges(self, ranges):
+        for item in ranges:
+            self.add(*item)
+
+    def load(self, path):
+        """ Add the ranges of a "start[-end] kind description" file, return how many were read """
+        count = 0
+        with open(path) as ranges_file:
+            for line_number, line in enumerate(ranges_file, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split(None, 2)
+                try:
+                    start, _, end = parts[0].upper().replace("AS", "").partition("-")
+                    self.add(start, end or start, parts[1] if len(parts) > 1 else "reserved",
+                             parts[2] if len(parts) > 2 else None)
+                    count += 1
+                except ValueError:
+                    print(f"===> ERROR: {path} line {line_number} is NOT a valid ASN range: {line} <===")
+        return count
+
+    def lookup(self, asn):
+        """ Return (start, end, kind, description) of the range holding asn, None for a normal ASN """
+        try:
+            asn = int(str(asn).upper().replace("AS", ""))
+        except ValueError:
+            return None
+        position = bisect_right(self.starts, asn) - 1
+        if position >= 0 and asn <= self.ranges[position][1]:
+            return self.ranges[position]
+        return None
+
+    def __contains__(self, asn):
+        return self.lookup(asn) is not None
+
+    def split(self, start, end):
+        """ Yield (start, end) sub ranges of range(start, end) outside every reserved range """
+        position = max(bisect_right(self.starts, start) - 1, 0)
+        for range_start, range_end, _, _ in self.ranges[position:]:
+            if range_start >= end:
+                break
+            if range_end < start:
+                continue
+            if range_start > start:
+                yield start, range_start
+            start = max(start, range_end + 1)
+        if start < end:
+            yield start, end
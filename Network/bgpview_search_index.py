@@ -0,0 +1,270 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Local search over ASN names, prefix descriptions and IX names that
+other lookups already collected. An inverted index maps every word to the
+records holding it, and a sorted word list turns the last, unfinished word
+of a type-ahead query into a binary search for the words starting with it.
+Answers come back as the same SearchResult as RequestBGPSearch, ranked
+best first. The API is only asked when a word of the query is not in
+the index, and its answer is added to the index for the next time.
+
+Example: python bgpview_search_index.py --snapshot asn.snap --save search.json digital ocean
+"""
+
+import argparse
+import json
+import math
+import re
+from bisect import bisect_left
+from dataclasses import asdict
+
+from bgpview_records import (AsnInfo, AsnRecord, PrefixRecord, IxRecord, PrefixDetail, IPDetail,
+                             IxDetail, SearchResult)
+from bgpview_snapshot import AsnSnapshot
+from bgpview_v2 import RequestBGPSearch
+
+API_URL = "https://api.bgpview.io/"
+
+""" kind = SearchResult list the record goes to, and its record class """
+KINDS = {
+    "asn": ("asns", AsnRecord),
+    "ipv4": ("ipv4_prefixes", PrefixRecord),
+    "ipv6": ("ipv6_prefixes", PrefixRecord),
+    "ix": ("internet_exchanges", IxRecord),
+}
+WORD = re.compile(r"[0-9a-z]+")
+""" Shorter unfinished words only match whole words, "a" would match most of the index """
+MIN_PREFIX = 2
+PREFIX_WEIGHT = 0.6
+
+
+def tokenize(text):
+    return WORD.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """ docs = [(kind, key, record, name)] by document number
+    postings = {word: set of document numbers}
+    """
+
+    def __init__(self):
+        self.docs = []
+        self.doc_ids = {}
+        self.doc_words = []
+        self.postings = {}
+        self.words = []
+        self.words_dirty = False
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, kind, key, record, name, *texts):
+        """ Index one record, a record with the same kind and key is replaced.
+        name = main text, ranked higher when the query starts it
+        """
+        words = set()
+        for text in (name, str(key)) + texts:
+            words.update(tokenize(text))
+
+        doc_id = self.doc_ids.get((kind, key))
+        if doc_id is None:
+            doc_id = self.doc_ids[(kind, key)] = len(self.docs)
+            self.docs.append(None)
+            self.doc_words.append(set())
+        for word in self.doc_words[doc_id] - words:
+            self.postings[word].discard(doc_id)
+        for word in words - self.doc_words[doc_id]:
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = set()
+                self.words_dirty = True
+            postings.add(doc_id)
+        self.docs[doc_id] = (kind, key, record, (name or "").lower())
+        self.doc_words[doc_id] = words
+
+    def add_record(self, record):
+        """ Index one bgpview_records object, nested records included """
+        if isinstance(record, (AsnInfo, AsnRecord)):
+            self.add("asn", record.asn, AsnRecord(record.asn, record.name, record.description, record.country,
+                                                  "search"),
+                     record.description, record.name, record.country)
+        elif isinstance(record, PrefixRecord):
+            if record.prefix is None:
+                return
+            kind = "ipv6" if ":" in record.prefix else "ipv4"
+            self.add(kind, record.prefix, PrefixRecord(record.prefix, record.parent, record.asn, record.name,
+                                                       record.description, record.country, kind),
+                     record.description, record.name, record.country)
+        elif isinstance(record, IxRecord):
+            if record.ix_id is None:
+                return
+            self.add("ix", record.ix_id, IxRecord(record.ix_id, None, record.name, record.name_full, None,
+                                                  record.country, record.city),
+                     record.name_full, record.name, record.city, record.country)
+        elif isinstance(record, IxDetail):
+            self.add_record(IxRecord(record.ix_id, None, record.name, record.name_full, None,
+                                     record.country, record.city))
+        elif isinstance(record, PrefixDetail):
+            self.add_record(PrefixRecord(record.prefix, None, record.asns[0].asn if record.asns else None,
+                                         record.name, record.description, record.country))
+            self.add_records(record.asns)
+        elif isinstance(record, IPDetail):
+            self.add_records(record.prefixes)
+        elif isinstance(record, SearchResult):
+            for kind_list in ("asns", "ipv4_prefixes", "ipv6_prefixes", "internet_exchanges"):
+                self.add_records(getattr(record, kind_list))
+
+    def add_records(self, records):
+        """ Index a list of records, or one record, for example BulkResult.records """
+        if records is None:
+            return
+        if isinstance(records, list):
+            for record in records:
+                self.add_record(record)
+        else:
+            self.add_record(records)
+
+    def vocabulary(self):
+        """ Sorted words, rebuilt after new words were added """
+        if self.words_dirty:
+            self.words = sorted(word for word, postings in self.postings.items() if postings)
+            self.words_dirty = False
+        return self.words
+
+    def word_matches(self, word, prefix):
+        """ Return {document: weight} of one query word, prefix = the word may be unfinished """
+        total = len(self.docs) or 1
+        matches = {}
+        postings = self.postings.get(word)
+        if postings:
+            weight = 1 + math.log(total / len(postings))
+            matches = dict.fromkeys(postings, weight)
+        if prefix and len(word) >= MIN_PREFIX:
+            words = self.vocabulary()
+            position = bisect_left(words, word)
+            while position < len(words) and words[position].startswith(word):
+                longer = words[position]
+                position += 1
+                if longer == word:
+                    continue
+                postings = self.postings[longer]
+                if not postings:
+                    continue
+                weight = PREFIX_WEIGHT * (1 + math.log(total / len(postings)))
+                for doc_id in postings:
+                    if matches.get(doc_id, 0) < weight:
+                        matches[doc_id] = weight
+        return matches
+
+    def covered(self, query):
+        """ True when every word of the query is in the index, the last one as a prefix """
+        words = tokenize(query)
+        if not words:
+            return False
+        return all(self.word_matches(word, index == len(words) - 1) for index, word in enumerate(words))
+
+    def search(self, query, limit=20):
+        """ Return [(score, kind, record)] of the records holding every word of the query, best first """
+        words = tokenize(query)
+        if not words:
+            return []
+        scores = None
+        for index, word in enumerate(words):
+            matches = self.word_matches(word, index == len(words) - 1)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+            if not scores:
+                return []
+
+        """ Records whose name starts with the query go first, then shorter names """
+        query_text = " ".join(words)
+        ranked = []
+        for doc_id, score in scores.items():
+            kind, key, record, name = self.docs[doc_id]
+            if name.startswith(query_text):
+                score += 1
+            ranked.append((score, -len(name), doc_id))
+        ranked.sort(reverse=True)
+        return [(score, self.docs[doc_id][0], self.docs[doc_id][2]) for score, _, doc_id in ranked[:limit]]
+
+    def search_result(self, query, limit=20):
+        """ Same SearchResult as RequestBGPSearch.get_records(), from the index only """
+        result = SearchResult(query=query)
+        for _, kind, record in self.search(query, limit):
+            getattr(result, KINDS[kind][0]).append(record)
+        return result
+
+    def save(self, path):
+        with open(path, "w") as index_file:
+            json.dump([[kind, asdict(record), name] for kind, _, record, name in self.docs], index_file)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path) as index_file:
+            for kind, values, _ in json.load(index_file):
+                index.add_record(KINDS[kind][1](**values))
+        return index
+
+
+class OfflineSearch:
+    """ RequestBGPSearch replacement, answers from the SearchIndex and only
+    asks the API for queries the index does not cover
+    """
+
+    def __init__(self, index=None, limit=20):
+        self.index = index if index is not None else SearchIndex()
+        self.limit = limit
+        self.local = 0
+        self.api = 0
+
+    def get_records(self, query):
+        """ Return SearchResult, None when the API also has nothing """
+        if self.index.covered(query):
+            self.local += 1
+            return self.index.search_result(query, self.limit)
+
+        self.api += 1
+        records = RequestBGPSearch(API_URL, query).get_records()
+        if records is not None:
+            self.index.add_record(records)
+        return records
+
+    def stats(self):
+        return {"local": self.local, "api": self.api, "documents": len(self.index)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline BGPView search")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--index", help="Index file written by --save")
+    parser.add_argument("--snapshot", help="Add every ASN of a bgpview_snapshot file")
+    parser.add_argument("--save", help="Write the index to this file")
+    parser.add_argument("--limit", type=int, default=20, help="Results per query")
+    parser.add_argument("--offline", action="store_true", help="Never ask the API")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex.load(args.index) if args.index else SearchIndex()
+    if args.snapshot:
+        with AsnSnapshot(args.snapshot) as snapshot:
+            for record in snapshot:
+                index.add_record(record)
+    print(f"Index: {len(index)} records, {len(index.postings)} words")
+
+    if args.query:
+        query = " ".join(args.query)
+        if args.offline:
+            result = index.search_result(query, args.limit)
+        else:
+            result = OfflineSearch(index, args.limit).get_records(query)
+        print(result)
+
+    if args.save:
+        index.save(args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Sharded multi-process sweep. The key range is cut into shards that
+workers lease from a SQLite lease board. A worker that dies stops renewing
+its lease, and after --lease-ttl seconds another worker takes the shard.
+Every worker process has its own session pool, all of them wait on one
+TokenBucket state file, so together they never go over --rate. Each shard
+writes a bgpview_journal file, so a re-leased shard only repeats the
+queries its dead worker had not finished. The shard journals are merged
+into one output file at the end.
+
+More machines can join when they share the directory of the board:
+    python bgpview_shard.py run --board sweep/board.db --start 0 --end 65555 --processes 4 --output asn.ndjson
+    python bgpview_shard.py worker --board sweep/board.db --processes 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from bgpview_bulk import LOOKUPS, bulk_lookup, journal_results
+from bgpview_export import open_writer, export_results, EXPORT_FORMATS
+from bgpview_journal import SweepJournal
+from bgpview_ratelimit import TokenBucket
+from bgpview_v2 import RequestBGPapi
+
+
+class LeaseBoard:
+    """ Shards and their leases in a SQLite file shared by every worker.
+    status = "pending", "leased" or "done"
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS shards (
+                               shard_id INTEGER PRIMARY KEY,
+                               start INTEGER,
+                               end INTEGER,
+                               status TEXT,
+                               owner TEXT,
+                               expires REAL,
+                               attempts INTEGER)""")
+        self.db.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)")
+
+    def plan(self, start, end, shard_size, settings):
+        """ Cut range(start, end) into shards, only when the board is new.
+        settings = lookups, rate and the other options every worker uses
+        """
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.db.execute("SELECT COUNT(*) FROM shards").fetchone()[0] == 0:
+                self.db.executemany("INSERT INTO shards VALUES (?, ?, ?, 'pending', NULL, 0, 0)",
+                                    [(shard_id, shard_start, min(shard_start + shard_size, end))
+                                     for shard_id, shard_start in enumerate(range(start, end, shard_size))])
+                self.db.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)",
+                                    [(name, json.dumps(value)) for name, value in settings.items()])
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def settings(self):
+        return {name: json.loads(value) for name, value in self.db.execute("SELECT name, value FROM settings")}
+
+    def acquire(self, owner, ttl):
+        """ Lease a pending shard, or one whose lease expired. Return (shard_id, start, end) or None """
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("""SELECT shard_id, start, end FROM shards
+                                     WHERE status = 'pending' OR (status = 'leased' AND expires < ?)
+                                     ORDER BY status DESC, shard_id LIMIT 1""", (now,)).fetchone()
+            if row is not None:
+                self.db.execute("""UPDATE shards SET status = 'leased', owner = ?, expires = ?,
+                                   attempts = attempts + 1 WHERE shard_id = ?""", (owner, now + ttl, row[0]))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return row
+
+    def renew(self, shard_id, owner, ttl):
+        """ Extend the lease, False when another worker took the shard """
+        cursor = self.db.execute("""UPDATE shards SET expires = ? WHERE shard_id = ? AND owner = ?
+                                    AND status = 'leased'""", (time.time() + ttl, shard_id, owner))
+        return cursor.rowcount == 1
+
+    def complete(self, shard_id, owner):
+        self.db.execute("UPDATE shards SET status = 'done', expires = 0 WHERE shard_id = ? AND owner = ?",
+                        (shard_id, owner))
+
+    def release(self, shard_id, owner):
+        """ Give the shard back right away, for example after an error """
+        self.db.execute("""UPDATE shards SET status = 'pending', owner = NULL, expires = 0
+                           WHERE shard_id = ? AND owner = ? AND status = 'leased'""", (shard_id, owner))
+
+    def progress(self):
+        """ Return {status: number of shards} """
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM shards GROUP BY status").fetchall())
+
+    def finished(self):
+        progress = self.progress()
+        return sum(progress.values()) > 0 and progress.get("done", 0) == sum(progress.values())
+
+    def journal_path(self, shard_id):
+        return os.path.join(self.directory, f"shard-{shard_id:06d}.journal")
+
+    def shards(self):
+        return [row[0] for row in self.db.execute("SELECT shard_id FROM shards ORDER BY shard_id")]
+
+    def close(self):
+        self.db.close()
+
+
+def run_worker(board_path, owner=None):
+    """ Lease shards from the board and sweep them until every shard is done.
+    Return the number of shards this worker finished.
+    """
+    board = LeaseBoard(board_path)
+    settings = board.settings()
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+    ttl = settings["lease_ttl"]
+
+    """ A forked worker must not reuse the connections of its parent """
+    RequestBGPapi.session = None
+    limiter = TokenBucket(settings["rate"], state_file=settings["rate_file"])
+    finished = 0
+
+    try:
+        while True:
+            lease = board.acquire(owner, ttl)
+            if lease is None:
+                """ Shards still leased by others may come back when their worker died """
+                if board.finished():
+                    return finished
+                time.sleep(min(ttl / 4, 5))
+                continue
+            shard_id, start, end = lease
+            last_renew = time.monotonic()
+            try:
+                with SweepJournal(board.journal_path(shard_id)) as journal:
+                    for _ in bulk_lookup(settings["lookups"], range(start, end), workers=settings["workers"],
+                                         limiter=limiter, journal=journal):
+                        if time.monotonic() - last_renew > ttl / 3:
+                            if not board.renew(shard_id, owner, ttl):
+                                print(f"===> ERROR: lease of shard {shard_id} was lost, {owner} stops it <===")
+                                break
+                            last_renew = time.monotonic()
+                    else:
+                        board.complete(shard_id, owner)
+                        finished += 1
+            except Exception:
+                board.release(shard_id, owner)
+                raise
+    finally:
+        board.close()
+
+
+def run_workers(board_path, processes):
+    """ Start processes workers and wait, restart the ones that crash while shards are left """
+    workers = []
+    for _ in range(processes):
+        worker = multiprocessing.Process(target=run_worker, args=(board_path,))
+        worker.start()
+        workers.append(worker)
+
+    board = LeaseBoard(board_path)
+    try:
+        while workers:
+            time.sleep(1)
+            for worker in list(workers):
+                if worker.is_alive():
+                    continue
+                worker.join()
+                workers.remove(worker)
+                if worker.exitcode != 0 and not board.finished():
+                    print(f"===> ERROR: worker {worker.pid} exit code {worker.exitcode}, start a new one <===")
+                    worker = multiprocessing.Process(target=run_worker, args=(board_path,))
+                    worker.start()
+                    workers.append(worker)
+    finally:
+        board.close()
+
+
+def unique_results(results, seen):
+    """ Skip the (lookup, key) pairs already in seen, a re-leased shard can journal a query twice """
+    for item in results:
+        if (item.lookup, str(item.key)) in seen:
+            continue
+        seen.add((item.lookup, str(item.key)))
+        yield item
+
+
+def merge_shards(board_path, output, export_format=None):
+    """ Write the results of every shard journal, in shard order, to one new file.
+    Every (lookup, key) is written once, even when two workers journaled it.
+    """
+    board = LeaseBoard(board_path)
+    writer = open_writer(output, export_format, append=False)
+    seen = set()
+    count = 0
+    try:
+        for shard_id in board.shards():
+            path = board.journal_path(shard_id)
+            if not os.path.exists(path):
+                print(f"===> ERROR: shard {shard_id} has no journal {path} <===")
+                continue
+            with SweepJournal(path) as journal:
+                count += export_results(unique_results(journal_results(journal), seen), writer)
+    finally:
+        writer.close()
+        board.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded multi-process bulk sweep")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Plan the shards, run workers, merge the output")
+    run_parser.add_argument("--lookup", action="append", choices=sorted(LOOKUPS),
+                            help="Lookup to run for every key, repeat for more (default: asn)")
+    run_parser.add_argument("--start", type=int, default=0, help="First AS number of the range")
+    run_parser.add_argument("--end", type=int, default=65555, help="Stop before this AS number")
+    run_parser.add_argument("--shard-size", type=int, default=1000, help="ASNs per lease")
+    run_parser.add_argument("--workers", type=int, default=4, help="Concurrent API requests per process")
+    run_parser.add_argument("--rate", type=float, default=5, help="Global API requests per second, all processes")
+    run_parser.add_argument("--lease-ttl", type=float, default=300, help="Seconds before a silent worker loses its shard")
+    run_parser.add_argument("--output", help="Merged output file")
+    run_parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output extension)")
+
+    worker_parser = commands.add_parser("worker", help="Join a planned sweep")
+    merge_parser = commands.add_parser("merge", help="Merge the shard journals into one file")
+    merge_parser.add_argument("--output", required=True, help="Merged output file")
+    merge_parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from --output extension)")
+
+    for command_parser in (run_parser, worker_parser, merge_parser):
+        command_parser.add_argument("--board", default="bgpview_shards/board.db", help="Lease board, shard journals go next to it")
+    for command_parser in (run_parser, worker_parser):
+        command_parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Worker processes on this machine")
+    args = parser.parse_args(argv)
+
+    start_time = datetime.now()
+    os.makedirs(os.path.dirname(os.path.abspath(args.board)), exist_ok=True)
+
+    if args.command == "run":
+        board = LeaseBoard(args.board)
+        board.plan(args.start, args.end, args.shard_size, {
+            "lookups": args.lookup or ["asn"],
+            "workers": args.workers,
+            "rate": args.rate,
+            "rate_file": os.path.join(board.directory, "rate.state"),
+            "lease_ttl": args.lease_ttl,
+        })
+        board.close()
+
+    if args.command in ("run", "worker"):
+        run_workers(args.board, args.processes)
+
+    board = LeaseBoard(args.board)
+    print(f"Shards: {board.progress()}, Running Time: {datetime.now() - start_time}", file=sys.stderr)
+    board.close()
+
+    if args.command in ("run", "merge") and args.output:
+        count = merge_shards(args.board, args.output, args.format)
+        print(f"Wrote {count} records to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Author: www.linkedin.com/in/whatwouldandydo
+Date: 2026-10-18
+Summary: Binary snapshot of RequestASN.get_asn_info results.
+Write it once from a sweep over the ASN range, then every worker process
+opens the same file with mmap. The OS page cache keeps one copy for all of
+them, nothing is parsed at load time and ASN -> AsnInfo is O(1).
+
+File layout, little endian:
+    header   MAGIC, version, first ASN, record count, ASN count, string table offset and size
+    records  one fixed width record per ASN from first ASN to the last one,
+             record index = asn - first ASN, absent ASNs are all zero
+    strings  string table, every distinct UTF-8 string stored once
+
+Example: python bgpview_snapshot.py write asn.snap --start 0 --end 65555
+         python bgpview_snapshot.py read asn.snap 6939 13335
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+from bgpview_bulk import bulk_lookup
+from bgpview_records import AsnInfo
+
+MAGIC = b"BGPVASN\0"
+VERSION = 1
+""" magic, version, first ASN, record count, ASNs present, string table offset, string table size """
+HEADER = struct.Struct("<8sIIIIQQ")
+""" flags, country, then (offset, length) of name, description, date_allocated,
+date_updated, rir_allocation_status and iana_assignment_status in the string table """
+RECORD = struct.Struct("<B2sx" + "IH" * 6)
+PRESENT = 1
+""" String offset of a None value """
+NO_STRING = 0xFFFFFFFF
+STRING_FIELDS = ("name", "description", "date_allocated", "date_updated",
+                 "rir_allocation_status", "iana_assignment_status")
+
+
+def write_snapshot(path, records):
+    """ Write AsnInfo records to path, return the number of ASNs written.
+    The file is written next to path and renamed over it, readers that
+    still have the old snapshot open keep their mapping.
+    """
+    by_asn = {}
+    for record in records:
+        if record is not None and record.asn is not None:
+            by_asn[int(record.asn)] = record
+    first_asn = min(by_asn) if by_asn else 0
+    count = max(by_asn) - first_asn + 1 if by_asn else 0
+
+    strings = {}
+    table = bytearray()
+
+    def add_string(value):
+        if value is None:
+            return NO_STRING, 0
+        offset = strings.get(value)
+        data = str(value).encode()[:0xFFFF]
+        if offset is None:
+            offset = strings[value] = len(table)
+            table.extend(data)
+        return offset, len(data)
+
+    record_data = bytearray(RECORD.size * count)
+    for asn, record in by_asn.items():
+        country = (record.country or "").encode("ascii", "replace")[:2].ljust(2, b"\0")
+        fields = []
+        for name in STRING_FIELDS:
+            fields.extend(add_string(getattr(record, name)))
+        RECORD.pack_into(record_data, (asn - first_asn) * RECORD.size, PRESENT, country, *fields)
+
+    strings_offset = HEADER.size + len(record_data)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, VERSION, first_asn, count, len(by_asn), strings_offset, len(table)))
+        snapshot_file.write(record_data)
+        snapshot_file.write(table)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_path, path)
+    return len(by_asn)
+
+
+class AsnSnapshot:
+    """ Read only, memory mapped view of a write_snapshot() file.
+    snapshot[6939] -> AsnInfo, KeyError when the ASN is not in the snapshot
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            self.map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        (magic, version, self.first_asn, self.count, self.asn_count,
+         self.strings_offset, strings_size) = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is NOT a bgpview ASN snapshot version {VERSION}")
+        if self.strings_offset + strings_size > len(self.map):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Release the mapping, AsnInfo objects already returned stay valid """
+        if self.map is not None:
+            self.view.release()
+            self.map.close()
+            self.map = None
+
+    def __len__(self):
+        """ Number of ASNs in the snapshot """
+        return self.asn_count
+
+    def record_offset(self, asn):
+        """ File offset of the ASN record, None when the ASN is outside the snapshot """
+        index = int(asn) - self.first_asn
+        if 0 <= index < self.count:
+            return HEADER.size + index * RECORD.size
+        return None
+
+    def string(self, offset, length):
+        if offset == NO_STRING:
+            return None
+        start = self.strings_offset + offset
+        return str(self.view[start:start + length], "utf-8", "replace")
+
+    def __contains__(self, asn):
+        offset = self.record_offset(asn)
+        return offset is not None and self.map[offset] & PRESENT != 0
+
+    def get(self, asn, default=None):
+        """ AsnInfo of the ASN, default when it is not in the snapshot """
+        offset = self.record_offset(asn)
+        if offset is None:
+            return default
+        flags, country, *fields = RECORD.unpack_from(self.map, offset)
+        if not flags & PRESENT:
+            return default
+        country = country.rstrip(b"\0").decode("ascii") or None
+        values = [self.string(fields[i], fields[i + 1]) for i in range(0, len(fields), 2)]
+        return AsnInfo(int(asn), values[0], values[1], country, *values[2:])
+
+    def __getitem__(self, asn):
+        record = self.get(asn)
+        if record is None:
+            raise KeyError(asn)
+        return record
+
+    def asns(self):
+        """ Yield every ASN in the snapshot, lowest first """
+        for index in range(self.count):
+            if self.map[HEADER.size + index * RECORD.size] & PRESENT:
+                yield self.first_asn + index
+
+    def __iter__(self):
+        """ Yield AsnInfo for every ASN in the snapshot """
+        for asn in self.asns():
+            yield self.get(asn)
+
+
+def sweep_records(start, end, workers=8, rate=5):
+    """ Yield AsnInfo for every valid ASN in range(start, end) using bgpview_bulk """
+    for item in bulk_lookup(["asn"], range(start, end), workers=workers, rate=rate):
+        if item.records is not None:
+            yield item.records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary ASN snapshot for fast loading in many processes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    write_parser = commands.add_parser("write", help="Sweep the ASN range and write a snapshot")
+    write_parser.add_argument("path", help="Snapshot file")
+    write_parser.add_argument("--start", type=int, default=0, help="First AS number of the range")
+    write_parser.add_argument("--end", type=int, default=65555, help="Stop before this AS number")
+    write_parser.add_argument("--workers", type=int, default=8, help="Concurrent API requests")
+    write_parser.add_argument("--rate", type=float, default=5, help="Global API requests per second")
+
+    read_parser = commands.add_parser("read", help="Print ASNs from a snapshot")
+    read_parser.add_argument("path", help="Snapshot file")
+    read_parser.add_argument("asns", nargs="+", type=int, help="AS numbers to print")
+    args = parser.parse_args(argv)
+
+    if args.command == "write":
+        count = write_snapshot(args.path, sweep_records(args.start, args.end, args.workers, args.rate))
+        print(f"Wrote {count} ASNs to {args.path}")
+        return
+
+    with AsnSnapshot(args.path) as snapshot:
+        for asn in args.asns:
+            print(snapshot.get(asn) or f"===> ERROR: AS{asn} is NOT in {args.path} <===")
+
+
+if __name__ == "__main__":
+    main()
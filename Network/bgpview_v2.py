@@ -7,16 +7,116 @@ Upstreams, Downstream and IP.
 """
 
 import requests
+import functools
 import json
 import time
+import threading
 import traceback
 from pprint import pprint
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
+from bgpview_cache import endpoint_type, memo_key, MemoCache, SingleFlight
+from bgpview_decode import load_decoder, iter_json_arrays, peek_status
+from bgpview_ratelimit import backoff_delay, parse_retry_after, TokenBucket
+from bgpview_reserved import ReservedAsnIndex
+from bgpview_records import (AsnInfo, AsnRecord, PrefixDetail, IPDetail, IxDetail, SearchResult,
+                             asn_record, prefix_record, ip_prefix_record, ix_record)
 
 """ Disable SSL self-sign certificate warning """
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 
 
+""" Attributes a memo hit keeps from the new object, they describe the request, not its answer.
+data_from_api and record_builder are not kept either, a memo entry would hold the
+whole decoded answer next to its records and strings, so after a memo hit
+data_from_api is None.
+"""
+MEMO_SKIP = ("api_endpoint", "asn_ip_var", "fetch_seconds", "data_from_api", "record_builder")
+
+
+def memo_get(key):
+    """ Return the memo entry of key, MemoCache.MISSING on a miss """
+    entry = RequestBGPapi.result_memo.get(key)
+    metrics = RequestBGPapi.metrics
+    if metrics is not None:
+        metrics.increment("bgpview_cache_lookups_total", cache="memo",
+                          result="miss" if entry is MemoCache.MISSING else "hit")
+    return entry
+
+
+def memo_set(request, key, result):
+    """ Keep the result and every attribute the getter set, only for successful API answers.
+    key = memo_key() taken before the getter ran, some getters rewrite asn_ip_var
+    """
+    if getattr(request, "api_status", None) == "ok":
+        state = {name: value for name, value in vars(request).items() if name not in MEMO_SKIP}
+        state["record_list"] = request.records
+        RequestBGPapi.result_memo.set(key, (result, state))
+
+
+def memo_restore(request, entry):
+    """ Put the getter attributes of a memo entry back on the request, return its result """
+    result, state = entry
+    vars(request).update(state)
+    request.data_from_api = None
+    return result
+
+
+def memoize_result(func):
+    """ Serve getter results from RequestBGPapi.result_memo when it is set.
+    Only successful API answers are kept, errors are queried again next time.
+    A raw_data given by the caller is always parsed, the memo is not used.
+    """
+    @functools.wraps(func)
+    def wrapper_memoize_result(self, raw_data=None):
+        if RequestBGPapi.result_memo is None or raw_data is not None:
+            return timed_getter(self, func, raw_data)
+
+        key = memo_key(self, func.__qualname__)
+        entry = memo_get(key)
+        if entry is not MemoCache.MISSING:
+            return memo_restore(self, entry)
+        result = timed_getter(self, func, raw_data)
+        memo_set(self, key, result)
+        return result
+    return wrapper_memoize_result
+
+
+def timed_getter(request, func, raw_data):
+    """ Run the getter, report its time without the API request to RequestBGPapi.metrics """
+    metrics = RequestBGPapi.metrics
+    if metrics is None:
+        return func(request, raw_data)
+    fetch_seconds = request.fetch_seconds
+    start = time.perf_counter()
+    result = func(request, raw_data)
+    metrics.observe("bgpview_parse_seconds",
+                    time.perf_counter() - start - (request.fetch_seconds - fetch_seconds),
+                    endpoint=endpoint_type(request.api_endpoint))
+    return result
+
+
+def prefix_strings(lines):
+    """ "<192.0.2.0/24 Description (US>)" of every ipv4_prefixes/ipv6_prefixes line """
+    return [f"<{line.get('prefix')} {line.get('description')} ({line.get('country_code')}>)" for line in lines]
+
+
+def parent_prefixes(lines):
+    """ Parent prefix of every ipv4_prefixes/ipv6_prefixes line that has one """
+    parents = []
+    for line in lines:
+        parent = line.get("parent")
+        if parent is not None and parent.get("prefix") is not None:
+            parents.append(parent["prefix"])
+    return parents
+
+
+def asn_strings(lines):
+    """ "<ASN: 394487 -- Name: Data Truck -- Location: US>" of every peer/upstream/downstream line """
+    return [f"<ASN: {line.get('asn')} -- Name: {line.get('description')} -- Location: {line.get('country_code')}>"
+            for line in lines]
+
+
 class RequestBGPapi:
     """ Replace as_number with number.
     Main URL = "https://api.bgpview.io/"
@@ -40,19 +140,124 @@ class RequestBGPapi:
     Search = https://api.bgpview.io/search?query_term=digitalocean
     """
 
+    """ One keep-alive session shared by every Request* object """
+    session = None
+    pool_connections = 10
+    pool_maxsize = 20
+    keep_alive = True
+    session_lock = threading.Lock()
+
+    """ Base URL that replaces https://api.bgpview.io/ in every request,
+    for example the bgpview_bench.py mock server, None for the real API """
+    api_base = None
+
+    """ Optional bgpview_cache.ResponseCache in front of the API """
+    response_cache = None
+
+    """ Optional bgpview_cache.MemoCache of parsed getter results """
+    result_memo = None
+
+    """ Threads asking for the same URL at the same time share one request,
+    None to send one request per caller """
+    single_flight = SingleFlight()
+
+    """ bgpview_ratelimit.TokenBucket every request waits on, shared by all threads.
+    The default of 2 requests per second is the pace of the old 0.5 second
+    sleep after every request. None turns the limit off, only do that when
+    something else keeps the request rate down.
+    """
+    rate_limiter = TokenBucket(2)
+    max_tries = 5
+
+    """ Reserved/private/documentation ASN ranges answered without a request,
+    None to always ask the API. Add ranges with reserved_asns.load(path) """
+    reserved_asns = ReservedAsnIndex()
+
+    """ Optional bgpview_metrics.Metrics, or any MetricsSink, every request reports to """
+    metrics = None
+
+    """ Fastest JSON decoder installed, change it with set_json_decoder() """
+    json_decoder_name, json_decoder = load_decoder()
+
+    """ Name of the getter method, get_records() runs it """
+    getter_name = None
+
     def __init__(self, api_endpoint, asn_ip_var):
         """ Get variables for API endpoint and ASN/IP/IX/Prefix """
         self.api_endpoint = api_endpoint
         self.asn_ip_var = asn_ip_var
-
-    def run_bgpview_api(self):
-        """ A Global method to run API request
-        Replace as_number, ip_address/cidr, ip_address, ix_id,
+        """ bgpview_records objects of the answer, see records """
+        self.records = None
+        """ Seconds spent in run_bgpview_api, cache and shared requests included """
+        self.fetch_seconds = 0.0
+
+    @property
+    def records(self):
+        """ bgpview_records objects of the answer. The list getters format their
+        strings straight from the API lines and leave a record_builder, the
+        records are built on first use, so callers of the strings never pay for them.
+        """
+        if self.record_builder is not None:
+            self.record_list = self.record_builder()
+            self.record_builder = None
+        return self.record_list
+
+    @records.setter
+    def records(self, records):
+        self.record_list = records
+        self.record_builder = None
+
+    def get_records(self, raw_data=None):
+        """ Run the getter and return its bgpview_records objects instead of strings """
+        getattr(self, self.getter_name)(raw_data)
+        return self.records
+
+    @classmethod
+    def configure_session(cls, pool_connections=10, pool_maxsize=20, keep_alive=True):
+        """ Build the shared connection pooled session.
+        pool_connections = number of host pools to keep
+        pool_maxsize = max open connections per host, set it to the
+        number of worker threads calling the API at the same time
+        keep_alive = False closes the connection after every request
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.verify = False
+
+        if keep_alive is False:
+            session.headers["Connection"] = "close"
+
+        if RequestBGPapi.session is not None:
+            RequestBGPapi.session.close()
+
+        RequestBGPapi.session = session
+        RequestBGPapi.pool_connections = pool_connections
+        RequestBGPapi.pool_maxsize = pool_maxsize
+        RequestBGPapi.keep_alive = keep_alive
+        return session
+
+    @classmethod
+    def set_json_decoder(cls, name=None):
+        """ name = "orjson", "simdjson", "json", None for the fastest installed """
+        RequestBGPapi.json_decoder_name, RequestBGPapi.json_decoder = load_decoder(name)
+
+    @classmethod
+    def get_session(cls):
+        """ Return the shared session, create it with defaults on first use """
+        if RequestBGPapi.session is None:
+            with RequestBGPapi.session_lock:
+                if RequestBGPapi.session is None:
+                    RequestBGPapi.configure_session(RequestBGPapi.pool_connections,
+                                                    RequestBGPapi.pool_maxsize,
+                                                    RequestBGPapi.keep_alive)
+        return RequestBGPapi.session
+
+    def build_bgpview_url(self):
+        """ Replace as_number, ip_address/cidr, ip_address, ix_id,
         and digitalocean with valid user entered variable
         """
-
-        self.data_from_api = None
-
         if "as_number" in self.api_endpoint:
             bgpview_url = self.api_endpoint.replace("as_number", str(self.asn_ip_var))
         elif "ip_address/cidr" in self.api_endpoint:
@@ -64,46 +269,140 @@ class RequestBGPapi:
         elif "digitalocean" in self.api_endpoint:
             bgpview_url = self.api_endpoint.replace("digitalocean", str(self.asn_ip_var))
 
+        if RequestBGPapi.api_base is not None:
+            bgpview_url = bgpview_url.replace("https://api.bgpview.io/", RequestBGPapi.api_base, 1)
         self.web_url = bgpview_url
+        return bgpview_url
 
-        """ When API request fails, retry it 3 times with 3 seconds wait """
-        query_try = 0
-        while query_try != 3:
-            try:
-                web_request = requests.get(f"{bgpview_url}", verify=False)
-                time.sleep(0.5)
+    def run_bgpview_api(self):
+        """ A Global method to run API request """
 
-                if web_request.status_code == 200:
-                    meta_data = web_request.json()
+        self.data_from_api = None
+        bgpview_url = self.build_bgpview_url()
+        start = time.perf_counter()
+
+        try:
+            cache = RequestBGPapi.response_cache
+            if cache is not None:
+                meta_data = cache.get(bgpview_url)
+                metrics = RequestBGPapi.metrics
+                if metrics is not None:
+                    metrics.increment("bgpview_cache_lookups_total", cache="response",
+                                      result="miss" if meta_data is None else "hit")
+                if meta_data is not None:
                     self.data_from_api = meta_data
-                    # "ok" or "error""
                     self.api_status = meta_data["status"]
-                    # "Query was successful" means good and has data
                     self.api_status_message = meta_data["status_message"]
-                    break
+                    return self.data_from_api, self.api_status, self.api_status_message
+
+            flights = RequestBGPapi.single_flight
+            if flights is None:
+                return self.request_bgpview_api(bgpview_url)
+            result = flights.do(bgpview_url, lambda: self.request_bgpview_api(bgpview_url))
+            self.data_from_api, self.api_status, self.api_status_message = result
+            return result
+        finally:
+            self.fetch_seconds += time.perf_counter() - start
+
+    def request_bgpview_api(self, bgpview_url):
+        """ Send the request, retry it and store the answer in the response cache """
+        cache = RequestBGPapi.response_cache
+        metrics = RequestBGPapi.metrics
+        endpoint = endpoint_type(self.api_endpoint)
+
+        def read_answer(web_request):
+            if metrics is not None:
+                metrics.increment("bgpview_response_bytes_total", len(web_request.content), endpoint=endpoint)
+            start = time.perf_counter()
+            meta_data = RequestBGPapi.json_decoder(web_request.content)
+            if metrics is not None:
+                metrics.observe("bgpview_decode_seconds", time.perf_counter() - start, endpoint=endpoint)
+            self.data_from_api = meta_data
+            # "ok" or "error""
+            self.api_status = meta_data["status"]
+            # "Query was successful" means good and has data
+            self.api_status_message = meta_data["status_message"]
+            if cache is not None:
+                cache.set(bgpview_url, meta_data, endpoint_type(self.api_endpoint))
+
+        self.api_status = None
+        self.api_status_message = None
+        self.send_bgpview_request(bgpview_url, read_answer)
+
+        """ Return as tupble(dict, str, str)
+        dict = self.data_from_api
+        str = self.api_status
+        str = self.api_status_message """
+        return self.data_from_api, self.api_status, self.api_status_message
+
+    def send_bgpview_request(self, bgpview_url, read_answer, stream=False):
+        """ Send the request, return read_answer(response) of the HTTP 200 answer, None when it failed.
+        When API request fails, retry it with exponential backoff.
+        Only exceptions, HTTP 429 and 5xx are retried, they wait for the
+        Retry-After header when the server sends one. An exception in
+        read_answer is retried too.
+        stream = True leaves the body unread for read_answer to stream
+        """
+        status_code = None
+        limiter = RequestBGPapi.rate_limiter
+        metrics = RequestBGPapi.metrics
+        endpoint = endpoint_type(self.api_endpoint)
+        for query_try in range(1, RequestBGPapi.max_tries + 1):
+            retry_after = None
+            try:
+                if limiter is not None:
+                    limiter.acquire()
+                start = time.perf_counter()
+                web_request = self.get_session().get(f"{bgpview_url}", verify=False, stream=stream)
+                status_code = web_request.status_code
+                if metrics is not None:
+                    metrics.observe("bgpview_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+                    metrics.increment("bgpview_requests_total", endpoint=endpoint, code=str(status_code))
+
+                if status_code == 200:
+                    answer = read_answer(web_request)
+                    if limiter is not None:
+                        limiter.speed_up()
+                    return answer
+
+                web_request.close()
+                if status_code != 429 and status_code < 500:
+                    """ Any other 4xx answer is the same on the next try """
+                    print(f"===> ERROR: {bgpview_url} status code {status_code} <===\n")
+                    if metrics is not None:
+                        metrics.increment("bgpview_failures_total", endpoint=endpoint)
+                    return None
+                retry_after = parse_retry_after(web_request.headers.get("Retry-After"))
+                if status_code == 429 and limiter is not None:
+                    limiter.slow_down()
 
             except Exception as e:
                 print(f"===> ERROR: {e.args} <===")
                 traceback.print_exc()
                 print()
+                if metrics is not None:
+                    metrics.increment("bgpview_errors_total", endpoint=endpoint, error=type(e).__name__)
 
-            query_try += 1
-            print("Sleep 3 seconds")
-            print(f"Query Try: {query_try}")
-            time.sleep(1)
-        else:
-            print(f"===> ERROR: Query request to {bgpview_url} three times but failed. <===")
-            print(f"===> ERROR: {bgpview_url} status code {web_request} <===\n")
+            if query_try == RequestBGPapi.max_tries:
+                print(f"===> ERROR: Query request to {bgpview_url} {query_try} times but failed. <===")
+                print(f"===> ERROR: {bgpview_url} status code {status_code} <===\n")
+                if metrics is not None:
+                    metrics.increment("bgpview_failures_total", endpoint=endpoint)
+                return None
 
-        """ Return as tupble(dict, str, str)
-        dict = self.data_from_api
-        str = self.api_status
-        str = self.api_status_message """
-        return self.data_from_api, self.api_status, self.api_status_message
+            delay = backoff_delay(query_try, retry_after)
+            print(f"Query Try: {query_try}, status code {status_code}, sleep {delay:.1f} seconds")
+            if metrics is not None:
+                metrics.increment("bgpview_retries_total", endpoint=endpoint)
+            time.sleep(delay)
 
 
 class RequestASN(RequestBGPapi):
-    """ Get ASN information such as owner, country, and more..."""
+    """ Get ASN information such as owner, country, and more...
+    records = AsnInfo
+    """
+    getter_name = "get_asn_info"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number"
         self.asn = None
@@ -113,8 +412,37 @@ class RequestASN(RequestBGPapi):
         self.asn_date_updated = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_info(self):
-        raw_data = self.run_bgpview_api()
+    def reserved_range(self):
+        """ (start, end, kind, description) when the ASN is in RequestBGPapi.reserved_asns """
+        reserved_asns = RequestBGPapi.reserved_asns
+        if reserved_asns is None:
+            return None
+        return reserved_asns.lookup(self.asn_ip_var)
+
+    def get_reserved_info(self, reserved):
+        """ Answer a reserved/private/documentation ASN locally, same format as get_asn_info """
+        start, end, kind, description = reserved
+        asn = int(str(self.asn_ip_var).upper().replace("AS", ""))
+        self.records = AsnInfo(asn=asn, description=description,
+                               rir_allocation_status=kind, iana_assignment_status="reserved")
+        self.asn = f"ASN: {asn}"
+        self.asn_name = description
+        if kind == "private":
+            self.asn_location = "Use within the Organization Network"
+        else:
+            self.asn_location = "N/A"
+        self.asn_date_allocated = "N/A"
+        self.asn_date_updated = "N/A"
+        return self.asn, self.asn_name, self.asn_location, self.asn_date_allocated, self.asn_date_updated
+
+    @memoize_result
+    def get_asn_info(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            reserved = self.reserved_range()
+            if reserved is not None:
+                return self.get_reserved_info(reserved)
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -124,17 +452,25 @@ class RequestASN(RequestBGPapi):
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
             elif status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                asn = data["asn"]
-                asn_name = data["description_short"]
-                asn_location = data["country_code"]
-                asn_date_allocated = data["rir_allocation"]["date_allocated"]
-                asn_date_updated = data["date_updated"]
-
-                # "assigned", "allocated", "available", "reserved", "unknown"
-                rir_allocation_status = data["rir_allocation"]["allocation_status"]
-
-                # "assigned", "reserved", "unknown" 
-                iana_assignment_status = data["iana_assignment"]["assignment_status"]
+                self.records = AsnInfo(
+                    asn=data["asn"],
+                    name=data["name"] if "name" in data else None,
+                    description=data["description_short"],
+                    country=data["country_code"],
+                    date_allocated=data["rir_allocation"]["date_allocated"],
+                    date_updated=data["date_updated"],
+                    # "assigned", "allocated", "available", "reserved", "unknown"
+                    rir_allocation_status=data["rir_allocation"]["allocation_status"],
+                    # "assigned", "reserved", "unknown"
+                    iana_assignment_status=data["iana_assignment"]["assignment_status"])
+
+                asn = self.records.asn
+                asn_name = self.records.description
+                asn_location = self.records.country
+                asn_date_allocated = self.records.date_allocated
+                asn_date_updated = self.records.date_updated
+                rir_allocation_status = self.records.rir_allocation_status
+                iana_assignment_status = self.records.iana_assignment_status
 
                 if iana_assignment_status == "assigned":
                     if "unknown" not in rir_allocation_status:
@@ -180,7 +516,11 @@ class RequestASN(RequestBGPapi):
 
 
 class RequestASNprefixes(RequestBGPapi):
-    """ Get prefixes IPv4 and IPv6 from the AS number """
+    """ Get prefixes IPv4 and IPv6 from the AS number
+    records = list of PrefixRecord
+    """
+    getter_name = "get_asn_prefixes"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number/prefixes"
         self.ipv4_prefixes = None
@@ -189,8 +529,11 @@ class RequestASNprefixes(RequestBGPapi):
         self.ipv6_parent_prefixes = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_prefixes(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_asn_prefixes(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -203,38 +546,16 @@ class RequestASNprefixes(RequestBGPapi):
 
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                ipv4_prefixes_list = data["ipv4_prefixes"]
-                ipv6_prefixes_list = data["ipv6_prefixes"]
-                
-                for line in ipv4_prefixes_list:
-                    for k, v in line.items():
-                        if type(v) == dict:
-                            if v["prefix"] is not None:
-                                parent = v["prefix"]
-                                ipv4_parent_prefixes.append(parent)
-                        elif k == "prefix":
-                            ip = v
-                        elif k == "description":
-                            name = v
-                        elif k == "country_code":
-                            location = v
-                            ipv4_info = f"<{ip} {name} ({location}>)"
-                            ipv4_prefixes.append(ipv4_info)
-
-                for line in ipv6_prefixes_list:
-                    for k, v in line.items():
-                        if type(v) == dict:
-                            if v["prefix"] is not None:
-                                parent = v["prefix"]
-                                ipv6_parent_prefixes.append(parent)
-                        elif k == "prefix":
-                            ip = v
-                        elif k == "description":
-                            name = v
-                        elif k == "country_code":
-                            location = v
-                            ipv6_info = f"<{ip} {name} ({location}>)"
-                            ipv6_prefixes.append(ipv6_info)
+                asn = int(self.asn_ip_var)
+                ipv4_lines = data["ipv4_prefixes"]
+                ipv6_lines = data["ipv6_prefixes"]
+                self.record_builder = lambda: ([prefix_record(line, "ipv4", asn) for line in ipv4_lines] +
+                                               [prefix_record(line, "ipv6", asn) for line in ipv6_lines])
+
+                ipv4_prefixes = prefix_strings(ipv4_lines)
+                ipv4_parent_prefixes = parent_prefixes(ipv4_lines)
+                ipv6_prefixes = prefix_strings(ipv6_lines)
+                ipv6_parent_prefixes = parent_prefixes(ipv6_lines)
             elif status == "error" or "Malformed" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
             else:
@@ -270,17 +591,70 @@ class RequestASNprefixes(RequestBGPapi):
 
         return self.ipv4_prefixes, self.ipv4_parent_prefixes, self.ipv6_prefixes, self.ipv6_parent_prefixes
 
+    def iter_prefix_records(self, chunk_size=65536):
+        """ Stream PrefixRecord objects from the API one at a time, IPv4 first.
+        The answer is never decoded as a whole, use it for ASNs with huge prefix
+        lists. It skips the response cache and the result memo, the request
+        waits on the rate limit and is retried like run_bgpview_api.
+        """
+        bgpview_url = self.build_bgpview_url()
+        asn = int(self.asn_ip_var)
+        web_request = self.send_bgpview_request(bgpview_url, lambda answer: answer, stream=True)
+        if web_request is None:
+            return
+
+        metrics = RequestBGPapi.metrics
+        received = 0
+
+        def count_bytes(chunks):
+            nonlocal received
+            for chunk in chunks:
+                received += len(chunk)
+                yield chunk
+
+        with web_request:
+            try:
+                status, status_message, chunks = peek_status(count_bytes(web_request.iter_content(chunk_size)))
+                self.api_status = status
+                self.api_status_message = status_message
+                if status == "error" or "Malformed input" in (status_message or ""):
+                    print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
+                    return
+                if status != "ok" or "Query was successful" not in status_message:
+                    print(f"===> Unkown Error: Please Review {self.web_url}, Status Code: {status}, Status Message:{status_message}<===\n")
+                    return
+                for key, line in iter_json_arrays(chunks, ("ipv4_prefixes", "ipv6_prefixes")):
+                    yield prefix_record(line, key[:4], asn)
+            except Exception as e:
+                print(f"===> ERROR: {e.args} <===")
+                traceback.print_exc()
+                print()
+                if metrics is not None:
+                    metrics.increment("bgpview_errors_total", endpoint=endpoint_type(self.api_endpoint),
+                                      error=type(e).__name__)
+            finally:
+                if metrics is not None:
+                    metrics.increment("bgpview_response_bytes_total", received,
+                                      endpoint=endpoint_type(self.api_endpoint))
+
 
 class RequestASNPeers(RequestBGPapi):
-    """ Get ASN IPv4 and IPv6 peering partners """
+    """ Get ASN IPv4 and IPv6 peering partners
+    records = list of AsnRecord
+    """
+    getter_name = "get_asn_peers"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number/peers"
         self.ipv4_asn_peers = None
         self.ipv6_asn_peers = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_peers(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_asn_peers(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -291,30 +665,13 @@ class RequestASNPeers(RequestBGPapi):
 
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                ipv4_peers_list = data["ipv4_peers"]
-                ipv6_peers_list = data["ipv6_peers"]
-
-                for line in ipv4_peers_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv4_asn_info = f"<{asn} -- {name} -- {location}>"
-                            ipv4_peers.append(ipv4_asn_info)
-
-                for line in ipv6_peers_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv6_asn_info = f"<{asn} -- {name} -- {location}>"
-                            ipv6_peers.append(ipv6_asn_info)
+                ipv4_lines = data["ipv4_peers"]
+                ipv6_lines = data["ipv6_peers"]
+                self.record_builder = lambda: ([asn_record(line, "peer", "ipv4") for line in ipv4_lines] +
+                                               [asn_record(line, "peer", "ipv6") for line in ipv6_lines])
+
+                ipv4_peers = asn_strings(ipv4_lines)
+                ipv6_peers = asn_strings(ipv6_lines)
             elif status == "error" or "Malformed" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
             else:
@@ -341,15 +698,22 @@ class RequestASNPeers(RequestBGPapi):
 
 
 class RequestANSupstreams(RequestBGPapi):
-    """ Get Upstream BGP AS number, names, and countries """
+    """ Get Upstream BGP AS number, names, and countries
+    records = list of AsnRecord
+    """
+    getter_name = "get_asn_upstreams"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number/upstreams"
         self.ipv4_upstreams_asn = None
         self.ipv6_upstreams_asn = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_upstreams(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_asn_upstreams(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -360,30 +724,13 @@ class RequestANSupstreams(RequestBGPapi):
 
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                ipv4_upstreams_list = data["ipv4_upstreams"]
-                ipv6_upstreams_list = data["ipv6_upstreams"]
-
-                for line in ipv4_upstreams_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv4_up_info = f"<{asn} -- {name} -- {location}>"
-                            ipv4_upstreams.append(ipv4_up_info)
-
-                for line in ipv6_upstreams_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv6_up_info = f"<{asn} -- {name} -- {location}>"
-                            ipv6_upstreams.append(ipv6_up_info)
+                ipv4_lines = data["ipv4_upstreams"]
+                ipv6_lines = data["ipv6_upstreams"]
+                self.record_builder = lambda: ([asn_record(line, "upstream", "ipv4") for line in ipv4_lines] +
+                                               [asn_record(line, "upstream", "ipv6") for line in ipv6_lines])
+
+                ipv4_upstreams = asn_strings(ipv4_lines)
+                ipv6_upstreams = asn_strings(ipv6_lines)
             elif status == "error" or "Malformed" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
             else:
@@ -411,15 +758,22 @@ class RequestANSupstreams(RequestBGPapi):
 
 
 class RequestASNdownstreams(RequestBGPapi):
-    """ Get Downstreams BGP AS number, names, and countries """
+    """ Get Downstreams BGP AS number, names, and countries
+    records = list of AsnRecord
+    """
+    getter_name = "get_asn_downstreams"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number/downstreams"
         self.ipv4_downstreams_asn = None
         self.ipv6_downstreams_asn = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_downstreams(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_asn_downstreams(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -430,30 +784,13 @@ class RequestASNdownstreams(RequestBGPapi):
 
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                ipv4_downstreams_list = data["ipv4_downstreams"]
-                ipv6_downstreams_list = data["ipv6_downstreams"]
-
-                for line in ipv4_downstreams_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv4_down_info = f"<{asn} -- {name} -- {location}>"
-                            ipv4_downstreams.append(ipv4_down_info)
-                
-                for line in ipv6_downstreams_list:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = f"ASN: {v}"
-                        elif k == "description":
-                            name = f"Name: {v}"
-                        elif k == "country_code":
-                            location = f"Location: {v}"
-                            ipv6_down_info = f"<{asn} -- {name} -- {location}>"
-                            ipv6_downstreams.append(ipv6_down_info)
+                ipv4_lines = data["ipv4_downstreams"]
+                ipv6_lines = data["ipv6_downstreams"]
+                self.record_builder = lambda: ([asn_record(line, "downstream", "ipv4") for line in ipv4_lines] +
+                                               [asn_record(line, "downstream", "ipv6") for line in ipv6_lines])
+
+                ipv4_downstreams = asn_strings(ipv4_lines)
+                ipv6_downstreams = asn_strings(ipv6_lines)
             elif status == "error" or "Malformed" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid AS number. <===\n")
             else:
@@ -483,14 +820,20 @@ class RequestASNixs(RequestBGPapi):
     """ Get Internet Exchange name, remote peers information
     such as AS number, name, IPv4/IPv6 peering addresses,
     city, country, and speed
+    records = list of IxRecord
     """
+    getter_name = "get_asn_ixs"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/asn/as_number/ixs"
         self.asn_ixs = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_asn_ixs(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_asn_ixs(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -501,43 +844,26 @@ class RequestASNixs(RequestBGPapi):
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
 
-                for line in data:
-                    for k, v in line.items():
-                        if k == "ix_id":
-                            ix = f"IX ID: {v}"
-                        elif k == "name":
-                            name = v
-                        elif k == "name_full":
-                            if name is not None:
-                                name_full = f"Name: {v} ({name})"
-                            else:
-                                name_full = f"Name: {v}"
-                        elif k == "country_code":
-                            country = v
-                        elif k == "city":
-                            if country is not None:
-                                location = f"Location: {v}, {country}"
-                            elif v is not None:
-                                location = f"Location: {v}"
-                            else:
-                                location = f"Location: None"
-                        elif k == "ipv4_address":
-                            if v is not None:
-                                ipv4 = f"IPv4 Address: {v}"
-                            else:
-                                ipv4 = f"IPv4 Address: None"
-                        elif k == "ipv6_address":
-                            if v is not None:
-                                ipv6 = f"IPv6 Address: {v}"
-                            else:
-                                ipv6 = f"IPv6 Address: None"
-                        elif k == "speed":
-                            if v == 0 or v == "0" or v is None:
-                                speed = f"Speed: None"
-                            else:
-                                speed = f"Speed: {v}"
-                            ixs_info = f"<{ix} -- {name_full} -- {location} -- {ipv4} -- {ipv6} -- {speed}>"
-                            ixs_list.append(ixs_info)
+                asn = int(self.asn_ip_var)
+                self.records = [ix_record(line, asn=asn) for line in data]
+
+                for record in self.records:
+                    if record.name is not None:
+                        name_full = f"Name: {record.name_full} ({record.name})"
+                    else:
+                        name_full = f"Name: {record.name_full}"
+
+                    if record.country is not None:
+                        location = f"Location: {record.city}, {record.country}"
+                    elif record.city is not None:
+                        location = f"Location: {record.city}"
+                    else:
+                        location = f"Location: None"
+
+                    ixs_info = (f"<IX ID: {record.ix_id} -- {name_full} -- {location} -- "
+                                f"IPv4 Address: {record.ipv4_address} -- IPv6 Address: {record.ipv6_address} -- "
+                                f"Speed: {record.speed}>")
+                    ixs_list.append(ixs_info)
             elif status == "error" or "Malformed" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid Internet Exchange number. <===\n")
             else:
@@ -557,14 +883,21 @@ class RequestASNixs(RequestBGPapi):
 
 
 class RequestPrefix(RequestBGPapi):
-    """ Get prefix owner, ASN, address, and upstreams ASN """
+    """ Get prefix owner, ASN, address, and upstreams ASN
+    records = PrefixDetail
+    """
+    getter_name = "get_prefix"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/prefix/ip_address/cidr"
         self.prefix_detail = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_prefix(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_prefix(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -575,25 +908,21 @@ class RequestPrefix(RequestBGPapi):
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
 
-                prefix = data["prefix"]
-                name = data["name"]
-                description_short = data["description_short"]
-                country = data["country_codes"]["whois_country_code"]
-                date_allocated = data["rir_allocation"]["date_allocated"]
-                asns = data["asns"]
-
-                for line in asns:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = v
-                        elif k == "name":
-                            as_name = v
-                        elif k == "description":
-                            as_desc = v
-                        elif k == "country_code":
-                            as_country = v
-                
-                prefix_info = f"<Prefix: {prefix} -- Name: {description_short} -- Location: {country} -- Date Assigned: {date_allocated} | ASN: {asn} Name: {as_name} Location:{as_country}>"
+                self.records = PrefixDetail(
+                    prefix=data["prefix"],
+                    name=data["name"],
+                    description=data["description_short"],
+                    country=data["country_codes"]["whois_country_code"],
+                    date_allocated=data["rir_allocation"]["date_allocated"])
+
+                self.records.asns = [asn_record(line, "origin") for line in data["asns"]]
+
+                detail = self.records
+                if len(detail.asns) != 0:
+                    origin = detail.asns[-1]
+                else:
+                    origin = AsnRecord(asn=None)
+                prefix_info = f"<Prefix: {detail.prefix} -- Name: {detail.description} -- Location: {detail.country} -- Date Assigned: {detail.date_allocated} | ASN: {origin.asn} Name: {origin.name} Location:{origin.country}>"
                 prefix_list.append(prefix_info)
             elif status == "error" and "Prefix not found" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} Prefix not found in BGP table or not a valid prefix. <===\n")
@@ -615,14 +944,21 @@ class RequestPrefix(RequestBGPapi):
 
 
 class RequestIPAddress(RequestBGPapi):
-    """ Get public IP address owner, ASN, and country"""
+    """ Get public IP address owner, ASN, and country
+    records = IPDetail
+    """
+    getter_name = "get_ip_address"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/ip/ip_address"
         self.ip_address_details = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_ip_address(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_ip_address(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -630,36 +966,26 @@ class RequestIPAddress(RequestBGPapi):
         try:
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                ip = data["ip"]
-
-                asn_list = []
+                self.records = IPDetail(ip=data["ip"])
 
-                ip_prefixes_list = data["prefixes"]
+                self.records.prefixes = [ip_prefix_record(line) for line in data["prefixes"] if line is not None]
 
-                if len(ip_prefixes_list) == 0:
+                asn_list = []
+                if len(self.records.prefixes) == 0:
                     prefix = "None"
                     description = "None"
                     ip_location = "None"
                     asn_list.append("None")
-                elif len(ip_prefixes_list) != 0:
-                    for line in ip_prefixes_list:
-                        if line is not None:
-                            for k, v in line.items():
-                                if k == "prefix":
-                                    prefix = v
-                                elif k == "description":
-                                    description = v
-                                elif k == "country_code":
-                                    ip_location = v
-                                elif k == "asn":
-                                    asn = v["asn"]
-                                    asn_desc = v["description"]
-                                    asn_location = v["country_code"]
-                                    if asn is not None:
-                                        asn_info = f"ASN: {asn}, Name: {asn_desc}, Location: {asn_location}"
-                                        asn_list.append(asn_info)
-
-                ip_info = f"<IP: {ip} Prefix: {prefix} -- Name: {description} -- Location: {ip_location} -- Used by Autonomous Systems: {asn_list}>"
+                else:
+                    for record in self.records.prefixes:
+                        prefix = record.prefix
+                        description = record.description
+                        ip_location = record.country
+                        if record.asn is not None:
+                            asn_info = f"ASN: {record.asn}, Name: {record.asn_description}, Location: {record.asn_country}"
+                            asn_list.append(asn_info)
+
+                ip_info = f"<IP: {self.records.ip} Prefix: {prefix} -- Name: {description} -- Location: {ip_location} -- Used by Autonomous Systems: {asn_list}>"
 
                 self.ip_address_details = ip_info
 
@@ -677,15 +1003,22 @@ class RequestIPAddress(RequestBGPapi):
 
 
 class RequestInternetExchange(RequestBGPapi):
-    """ Get Internet Exchange name, name, and member ASNs, IPv4/IPv6, speed"""
+    """ Get Internet Exchange name, name, and member ASNs, IPv4/IPv6, speed
+    records = IxDetail
+    """
+    getter_name = "get_internet_exchange"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/ix/ix_id"
         self.internet_exchange_details = None
         self.internet_exchange_members = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_internet_exchange(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_internet_exchange(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -694,41 +1027,31 @@ class RequestInternetExchange(RequestBGPapi):
         try:
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                name = data["name_full"]
-                city = data["city"]
-                country = data["country_code"]
-                ix_asn_members = data["members_count"]
-                asn_members = data["members"]
-
-                if city is None:
-                    ix_info = f"IX: {self.asn_ip_var} -- Name: {name} -- ASN Membership: {ix_asn_members} -- Location: {country}"
+                self.records = IxDetail(
+                    ix_id=data["id"] if "id" in data else self.asn_ip_var,
+                    name=data["name"] if "name" in data else None,
+                    name_full=data["name_full"],
+                    city=data["city"],
+                    country=data["country_code"],
+                    members_count=data["members_count"])
+
+                ix_id = self.records.ix_id
+                self.records.members = [ix_record(line, ix_id=ix_id) for line in data["members"]]
+
+                detail = self.records
+                if detail.city is None:
+                    ix_info = f"IX: {self.asn_ip_var} -- Name: {detail.name_full} -- ASN Membership: {detail.members_count} -- Location: {detail.country}"
                     self.internet_exchange_details = ix_info
                 else:
-                    ix_info = f"IX: {self.asn_ip_var} -- Name: {name} -- ASN Membership: {ix_asn_members} -- Location: {city}, {country}"
+                    ix_info = f"IX: {self.asn_ip_var} -- Name: {detail.name_full} -- ASN Membership: {detail.members_count} -- Location: {detail.city}, {detail.country}"
                     self.internet_exchange_details = ix_info
 
                 as_info_list = []
-                for line in asn_members:
-                    for k, v in line.items():
-                        if k == "asn":
-                            asn = v
-                        elif k == "description":
-                            as_name = v
-                        elif k == "country_code":
-                            as_location = v
-                        elif k == "ipv4_address":
-                            ipv4 = v
-                        elif k == "ipv6_address":
-                            ipv6 = v
-                        elif k == "speed":
-                            if v == 0:
-                                speed = None
-                            else:
-                                speed = v
-                                as_info = f"<ASN: {asn}, Name: {as_name}, Location: {as_location}, IPv4: {ipv4}, IPv6: {ipv6}, Speed: {speed}>"
-                                as_info_list.append(as_info)
-                    
-                    self.internet_exchange_members = as_info_list
+                for record in detail.members:
+                    as_info = f"<ASN: {record.asn}, Name: {record.description}, Location: {record.country}, IPv4: {record.ipv4_address}, IPv6: {record.ipv6_address}, Speed: {record.speed}>"
+                    as_info_list.append(as_info)
+
+                self.internet_exchange_members = as_info_list
 
             elif status == "error" and "Could not find IX" in status_message:
                 print(f"===> ERROR: {self.asn_ip_var} is NOT a valid entry. <===\n")
@@ -745,7 +1068,11 @@ class RequestInternetExchange(RequestBGPapi):
 class RequestBGPSearch(RequestBGPapi):
     """ Search for word in BGPView.
     Data return as dict key name asn,
-    ipv4_prefixes, ipv6_prefixes, internet_exchanges """
+    ipv4_prefixes, ipv6_prefixes, internet_exchanges
+    records = SearchResult
+    """
+    getter_name = "get_search_result"
+
     def __init__(self, api_endpoint, asn_ip_var):
         api_endpoint = "https://api.bgpview.io/search?query_term=digitalocean"
         self.asn_ip_var = asn_ip_var
@@ -755,8 +1082,11 @@ class RequestBGPSearch(RequestBGPapi):
         self.internet_exchanges_info = None
         super().__init__(api_endpoint, asn_ip_var)
 
-    def get_search_result(self):
-        raw_data = self.run_bgpview_api()
+    @memoize_result
+    def get_search_result(self, raw_data=None):
+        """ raw_data = run_bgpview_api() result, fetch it when not given """
+        if raw_data is None:
+            raw_data = self.run_bgpview_api()
         meta_data = raw_data[0]
         status = raw_data[1]
         status_message = raw_data[2]
@@ -764,73 +1094,35 @@ class RequestBGPSearch(RequestBGPapi):
         try:
             if status == "ok" and "Query was successful" in status_message:
                 data = meta_data["data"]
-                asns = data["asns"]
-                ipv4_prefixes = data["ipv4_prefixes"]
-                ipv6_prefixes = data["ipv6_prefixes"]
-                internet_exchanges = data["internet_exchanges"]
+                self.records = SearchResult(query=str(self.asn_ip_var))
+
+                self.records.asns = [asn_record(line, "search") for line in data["asns"]]
+                self.records.ipv4_prefixes = [prefix_record(line, "ipv4") for line in data["ipv4_prefixes"]]
+                self.records.ipv6_prefixes = [prefix_record(line, "ipv6") for line in data["ipv6_prefixes"]]
+                self.records.internet_exchanges = [ix_record(line) for line in data["internet_exchanges"]]
 
                 asn_list = []
-                if len(asns) != 0:
-                    for line in asns:
-                        for k, v in line.items():
-                            if k == "asn":
-                                as_num = v
-                            elif k == "name":
-                                as_name = v
-                            elif k == "description":
-                                as_desc = v
-                            elif k == "country_code":
-                                as_location = v
-                                as_info = f"<ASN: {as_num}, Name: {as_name}, Description:{as_desc}, Location: {as_location}>"
-                                asn_list.append(as_info)
+                for record in self.records.asns:
+                    as_info = f"<ASN: {record.asn}, Name: {record.name}, Description:{record.description}, Location: {record.country}>"
+                    asn_list.append(as_info)
 
                 ipv4_list = []
-                if len(ipv4_prefixes) != 0:
-                    for line in ipv4_prefixes:
-                        for k, v in line.items():
-                            if k == "prefix":
-                                ipv4_pref = v
-                                print(ipv4_pref)
-                            elif k == "country_code":
-                                ipv4_location = v
-                            elif k == "description":
-                                ipv4_name = v
-                                ipv4_info = f"<IPv4 Prefix: {ipv4_pref}, Name: {ipv4_name}, Location: {ipv4_location}>"
-                                ipv4_list.append(ipv4_info)
+                for record in self.records.ipv4_prefixes:
+                    ipv4_info = f"<IPv4 Prefix: {record.prefix}, Name: {record.description}, Location: {record.country}>"
+                    ipv4_list.append(ipv4_info)
 
                 ipv6_list = []
-                if len(ipv6_prefixes) != 0:
-                    for line in ipv6_prefixes:
-                        for k, v in line.items():
-                            if k == "prefix":
-                                ipv6_pref = v
-                            elif k == "country_code":
-                                ipv6_location = v
-                            elif k == "description":
-                                ipv6_name = v
-                                ipv6_info = f"<IPv4 Prefix: {ipv6_pref}, Name: {ipv6_name}, Location: {ipv6_location}>"
-                                ipv6_list.append(ipv6_info)
+                for record in self.records.ipv6_prefixes:
+                    ipv6_info = f"<IPv6 Prefix: {record.prefix}, Name: {record.description}, Location: {record.country}>"
+                    ipv6_list.append(ipv6_info)
 
                 ix_list = []
-                if len(internet_exchanges) != 0:
-                    for line in internet_exchanges:
-                        for k, v in line.items():
-                            if k == "ix_id":
-                                ix_id = v
-                            elif k == "name_full":
-                                ix_name = v
-                            elif k == "country_code":
-                                ix_country = v
-                            elif k == "city":
-                                ix_city = v
-                                if ix_city is None:
-                                    ix_info = f"<Internet Exchange ID: {ix_id}, Name: {ix_name}, Location: {ix_country}>"
-                                    ix_list.append(ix_info)
-                                else:
-                                    ix_info = f"<Internet Exchange ID: {ix_id}, Name: {ix_name}, Location: {ix_city}, {ix_country}>"
-                                    ix_list.append(ix_info)
-                else:
-                    print(f"===> Unkown Error: Please Review {self.web_url}, Status Code: {status}, Status Message:{status_message}<===\n")
+                for record in self.records.internet_exchanges:
+                    if record.city is None:
+                        ix_info = f"<Internet Exchange ID: {record.ix_id}, Name: {record.name_full}, Location: {record.country}>"
+                    else:
+                        ix_info = f"<Internet Exchange ID: {record.ix_id}, Name: {record.name_full}, Location: {record.city}, {record.country}>"
+                    ix_list.append(ix_info)
 
                 self.asn_ip_var = f'BGPView Search: "{self.asn_ip_var}" '
 
@@ -853,6 +1145,8 @@ class RequestBGPSearch(RequestBGPapi):
                     self.internet_exchanges_info = ix_list
                 else:
                     self.internet_exchanges_info = f"No Internet Exchange Information Found."
+            else:
+                print(f"===> Unkown Error: Please Review {self.web_url}, Status Code: {status}, Status Message:{status_message}<===\n")
 
         except Exception as e:
             print(f"===> ERROR: {e.args} <===")
@@ -900,45 +1194,7 @@ if __name__ == "__main__":
     # print(t10.get_search_result())
 
 
-    import datetime
-
-    d1 = datetime.datetime.now()
-
-    for i in range(65555):
-    # for i in range(64000, 65555):
-        d2 = datetime.datetime.now()
-        t1 = RequestASN(a, i)
-        print(t1.get_asn_info())
-        print()
-        
-        # t2 = RequestASNprefixes(a, i)
-        # print(t2.get_asn_prefixes())
-
-        # t3 = RequestASNPeers(a, i)
-        # print(t3.get_asn_peers())
-
-        # t4 = RequestANSupstreams(a, i)
-        # print(t4.get_asn_upstreams())
-
-        # t5 = RequestASNdownstreams(a, i)
-        # print(t5.get_asn_downstreams())
-
-        # t6 = RequestASNixs(a, i)
-        # print(t6.get_asn_ixs())
-
-        # t7 = RequestPrefix(a, c)
-        # print(t7.get_prefix())
-
-        # t8 = RequestIPAddress(a, d)
-        # print(t8.get_ip_address())
-
-        # t9 = RequestInternetExchange(a, i)
-        # print(t9.get_internet_exchange())
-
-        # t10 = RequestBGPSearch(a, e)
-        # print(t10.get_search_result())
-
-        d3 = datetime.datetime.now()
-        print(f"Running Time: {d2 - d1}")
-        print(f"Query Time: {d3 - d2}")
-        print()
+    """ Full ASN sweep runs on the bulk engine, see bgpview_bulk.py for all options.
+    The journal lets a killed sweep continue where it stopped. """
+    from bgpview_bulk import main as bulk_main
+    bulk_main(["--lookup", "asn", "--start", "0", "--end", "65555", "--journal", "bgpview_sweep.journal"])